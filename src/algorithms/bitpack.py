@@ -0,0 +1,137 @@
+# Bit-packed binary solutions: 64 variables per uint64 word
+import numpy as np
+from .local_field import qubo_energies
+
+WORD_BITS = 64
+
+# Rows unpacked at a time when evaluating energies, bounding the int64 copy
+UNPACK_ROWS = 1024
+
+# Set bits per byte value, for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def num_words(num_vars):
+    return (num_vars + WORD_BITS - 1) // WORD_BITS
+
+
+def pack_solutions(solutions):
+    """
+    Packs a 0/1 vector or (P, n) array into uint64 words, variable i in bit
+    i % 64 of word i // 64. Unused bits of the last word are zero.
+    """
+    solutions = np.atleast_2d(np.asarray(solutions))
+    num_vars = solutions.shape[1]
+    packed = np.packbits(solutions.astype(bool), axis=1, bitorder="little")
+    padded = np.zeros((len(solutions), num_words(num_vars) * 8), dtype=np.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return padded.view("<u8")
+
+
+def unpack_solutions(words, num_vars):
+    """
+    Inverse of pack_solutions: returns the (P, n) int64 solutions.
+    """
+    words = np.atleast_2d(words)
+    bits = np.unpackbits(np.ascontiguousarray(words, dtype="<u8").view(np.uint8), axis=1,
+                         count=num_vars, bitorder="little")
+    return bits.astype(np.int64)
+
+
+def tail_mask(num_vars):
+    """
+    Mask of the bits of the last word that hold variables.
+    """
+    used = num_vars - (num_words(num_vars) - 1) * WORD_BITS
+    return np.uint64((1 << used) - 1) if used < WORD_BITS else ~np.uint64(0)
+
+
+def random_words(pop_size, num_vars):
+    """
+    Returns pop_size uniformly random packed solutions.
+    """
+    words = np.random.randint(0, 256, (pop_size, num_words(num_vars) * 8), dtype=np.uint8).view("<u8")
+    words[:, -1] &= tail_mask(num_vars)
+    return words
+
+
+def popcount(words):
+    """
+    Returns the number of set bits in each row of words.
+    """
+    words = np.atleast_2d(words)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return _BYTE_POPCOUNT[np.ascontiguousarray(words).view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def hamming_distances(words, reference):
+    """
+    Returns the Hamming distance of every packed solution to reference.
+    """
+    return popcount(np.atleast_2d(words) ^ reference)
+
+
+def mean_pairwise_distance(words, num_vars):
+    """
+    Returns the average Hamming distance over all pairs of individuals, from
+    the number of ones per variable: sum_i c_i (P - c_i) / (P (P - 1) / 2).
+    Runs in O(P n) without forming pairs.
+    """
+    pop_size = len(words)
+    if pop_size < 2:
+        return 0.0
+    ones = np.zeros(num_vars, dtype=np.int64)
+    for start in range(0, pop_size, UNPACK_ROWS):
+        ones += unpack_solutions(words[start:start + UNPACK_ROWS], num_vars).sum(axis=0)
+    return float((ones * (pop_size - ones)).sum() / (pop_size * (pop_size - 1) / 2))
+
+
+def packed_energies(qubo_matrix, words, num_vars, constant=0.0):
+    """
+    Computes the energy of each packed solution, unpacking UNPACK_ROWS rows
+    at a time.
+    """
+    energies = np.empty(len(words))
+    for start in range(0, len(words), UNPACK_ROWS):
+        solutions = unpack_solutions(words[start:start + UNPACK_ROWS], num_vars)
+        energies[start:start + len(solutions)] = qubo_energies(qubo_matrix, solutions, constant)
+    return energies
+
+
+def packed_crossover(parents, num_vars, num_offspring):
+    """
+    Single-point crossover on packed parents: each child takes the bits
+    below a random point from one parent and the rest from another, merged
+    with one mask per word.
+    """
+    num_parents, word_count = parents.shape
+    first = np.random.randint(num_parents, size=num_offspring)
+    # Offset the second parent so the pair is always distinct
+    second = (first + np.random.randint(1, num_parents, size=num_offspring)) % num_parents
+    crossover_points = np.random.randint(1, num_vars, size=num_offspring)
+
+    # Bits of each word below the crossover point: all, none or the low `partial` bits
+    word_starts = np.arange(word_count) * WORD_BITS
+    partial = np.clip(crossover_points[:, None] - word_starts, 0, WORD_BITS).astype(np.uint64)
+    full = partial == WORD_BITS
+    masks = np.where(full, ~np.uint64(0), (np.uint64(1) << np.where(full, 0, partial).astype(np.uint64)) - np.uint64(1))
+    return (parents[first] & masks) | (parents[second] & ~masks)
+
+
+def packed_mutate(words, num_vars, mutation_rate):
+    """
+    Flips each bit with probability mutation_rate. Only the flipped
+    positions are drawn, so the cost is proportional to the number of flips
+    rather than to the number of bits.
+    """
+    pop_size = len(words)
+    flips = np.random.binomial(pop_size * num_vars, mutation_rate)
+    if flips == 0:
+        return words
+    positions = np.random.randint(0, pop_size * num_vars, size=flips)
+    rows, variables = np.divmod(positions, num_vars)
+    bits = np.uint64(1) << (variables % WORD_BITS).astype(np.uint64)
+    # A position drawn twice flips back, which is rare at GA mutation rates
+    np.bitwise_xor.at(words, (rows, variables // WORD_BITS), bits)
+    return words
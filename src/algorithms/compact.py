@@ -0,0 +1,264 @@
+# Compact QUBO storage: upper triangle plus diagonal in the smallest lossless dtype
+import numpy as np
+import scipy.sparse as sp
+
+# Candidate storage types, smallest first; float64 is the fallback
+COMPACT_DTYPES = (np.int16, np.int32, np.float32)
+
+# Rows of a dense matrix expanded to float64 at a time, about 8 MB per block
+BLOCK_BYTES = 8 << 20
+
+
+def _exact(values, dtype):
+    with np.errstate(over="ignore", invalid="ignore"):
+        return np.array_equal(values.astype(dtype).astype(float), values)
+
+
+def compact_dtype(values):
+    """
+    Returns the smallest dtype of COMPACT_DTYPES that represents every value
+    exactly, or float64 if none does.
+    """
+    values = np.asarray(values, dtype=float)
+    for dtype in COMPACT_DTYPES:
+        if _exact(values, dtype):
+            return np.dtype(dtype)
+    return np.dtype(float)
+
+
+def coupling_product(coupling, solutions):
+    """
+    Returns solutions @ coupling in float64 for a symmetric coupling matrix,
+    which may be a CompactQUBO, and a solution vector or (R, n) batch.
+    """
+    if isinstance(coupling, CompactQUBO):
+        return coupling.product(solutions)
+    return np.asarray(np.asarray(solutions) @ coupling, dtype=float)
+
+
+def add_coupling_row(coupling, target, index, scale):
+    """
+    Adds scale times row index of a symmetric coupling matrix (dense, CSR
+    or CompactQUBO) to the float64 vector target, in place.
+    """
+    if isinstance(coupling, CompactQUBO):
+        coupling.add_row(target, index, scale)
+    elif sp.issparse(coupling):
+        start, end = coupling.indptr[index], coupling.indptr[index + 1]
+        target[coupling.indices[start:end]] += scale * coupling.data[start:end]
+    elif scale == 1:
+        target += coupling[index]
+    elif scale == -1:
+        target -= coupling[index]
+    else:
+        target += scale * coupling[index]
+
+
+def _pair_couplings(qubo_matrix, row):
+    # Q_ij + Q_ji for j > row, as float64
+    return np.asarray(qubo_matrix[row, row + 1:], dtype=float) + qubo_matrix[row + 1:, row]
+
+
+class CompactQUBO:
+    """
+    Canonical QUBO storage holding only what the energy depends on: the
+    diagonal Q_ii and the pair couplings J_ij = Q_ij + Q_ji for i < j, so
+        E(x) = sum_i Q_ii x_i + sum_{i<j} J_ij x_i x_j + constant
+    Dense matrices keep J as a packed row-major triangle of n(n-1)/2 values,
+    sparse ones as a strictly upper triangular CSR matrix. Values use the
+    smallest of int16, int32 and float32 that holds them (and twice the
+    diagonal, as in Q + Q^T) exactly, else float64.
+
+    Compared to a float64 n x n array this halves memory at equal precision
+    and divides it by up to eight for small integer coefficients.
+    """
+    def __init__(self, upper, diagonal, num_vars):
+        self.upper = upper
+        self.diagonal = diagonal
+        self.num_vars = num_vars
+        self.sparse = sp.issparse(upper)
+        if self.sparse:
+            # Column access for the lower half of each coupling row
+            self._columns = upper.tocsc()
+        else:
+            rows = np.arange(num_vars, dtype=np.int64)
+            self._offsets = rows * (2 * num_vars - rows - 1) // 2
+            # Entry (r, c) of the triangle, r < c, is at _column_base[r] + c
+            self._column_base = self._offsets - rows - 1
+
+    @classmethod
+    def from_matrix(cls, qubo_matrix, dtype=None):
+        """
+        Builds the compact form of a dense or scipy.sparse QUBO matrix. The
+        dtype is chosen automatically unless given.
+        """
+        if isinstance(qubo_matrix, CompactQUBO):
+            return qubo_matrix
+        num_vars = qubo_matrix.shape[0]
+        if sp.issparse(qubo_matrix):
+            qubo_matrix = qubo_matrix.tocsr().astype(float)
+            diagonal = qubo_matrix.diagonal()
+            upper = sp.triu(qubo_matrix + qubo_matrix.T, k=1, format="csr")
+            upper.eliminate_zeros()
+            if dtype is None:
+                dtype = compact_dtype(np.concatenate([upper.data, 2 * diagonal]))
+            return cls(upper.astype(dtype), diagonal.astype(dtype), num_vars)
+
+        # Dense: a first pass over the rows picks the dtype, a second fills
+        # the packed triangle, so no n x n or float64 triangle temporary is made
+        diagonal = np.asarray(np.diag(qubo_matrix), dtype=float).copy()
+        if dtype is None:
+            exact = [_exact(2 * diagonal, candidate) for candidate in COMPACT_DTYPES]
+            block = max(1, BLOCK_BYTES // (8 * max(num_vars, 1)))
+            for start in range(0, num_vars, block):
+                if not any(exact):
+                    break
+                # Full rows of Q + Q^T; the lower half repeats the upper one
+                values = np.asarray(qubo_matrix[start:start + block], dtype=float) + qubo_matrix[:, start:start + block].T
+                exact = [fits and _exact(values, candidate) for fits, candidate in zip(exact, COMPACT_DTYPES)]
+            dtype = next((candidate for fits, candidate in zip(exact, COMPACT_DTYPES) if fits), float)
+        upper = np.empty(num_vars * (num_vars - 1) // 2, dtype=dtype)
+        offset = 0
+        for row in range(num_vars - 1):
+            length = num_vars - row - 1
+            upper[offset:offset + length] = _pair_couplings(qubo_matrix, row)
+            offset += length
+        return cls(upper, diagonal.astype(dtype), num_vars)
+
+    @property
+    def shape(self):
+        return (self.num_vars, self.num_vars)
+
+    @property
+    def dtype(self):
+        return self.diagonal.dtype
+
+    @property
+    def nbytes(self):
+        if self.sparse:
+            stored = self.upper.data.nbytes + self.upper.indices.nbytes + self.upper.indptr.nbytes
+        else:
+            stored = self.upper.nbytes
+        return stored + self.diagonal.nbytes
+
+    def _row_offset(self, row):
+        # Start of row `row` (its entries for columns row+1..n-1) in the packed triangle
+        return int(self._offsets[row])
+
+    def add_row(self, target, index, scale):
+        """
+        Adds scale times row index of Q + Q^T to the float64 vector target
+        in place, reading the row from the packed triangle (or the upper
+        CSR matrix and its columns) in O(n) (or O(nnz of the row)).
+        """
+        target[index] += scale * 2 * self.diagonal[index]
+        if self.sparse:
+            start, end = self.upper.indptr[index], self.upper.indptr[index + 1]
+            target[self.upper.indices[start:end]] += scale * self.upper.data[start:end]
+            start, end = self._columns.indptr[index], self._columns.indptr[index + 1]
+            target[self._columns.indices[start:end]] += scale * self._columns.data[start:end]
+            return
+        offset = self._offsets[index]
+        target[index + 1:] += scale * self.upper[offset:offset + self.num_vars - index - 1]
+        # Column index above the diagonal: entry (r, index) of each row r < index
+        target[:index] += scale * self.upper[self._column_base[:index] + index]
+
+    def product(self, solutions):
+        """
+        Returns solutions @ (Q + Q^T) for a solution vector or (R, n) batch.
+        """
+        solutions = np.asarray(solutions)
+        return self.field(solutions) + 2 * self.diagonal.astype(float) * solutions
+
+    def _upper_rows(self, start, stop):
+        """
+        Returns the strictly upper triangular rows start..stop-1 as a dense
+        float64 block of shape (stop - start, n).
+        """
+        if self.sparse:
+            return self.upper[start:stop].toarray()
+        block = np.zeros((stop - start, self.num_vars))
+        for row in range(start, stop):
+            offset = self._row_offset(row)
+            block[row - start, row + 1:] = self.upper[offset:offset + self.num_vars - row - 1]
+        return block
+
+    def _blocks(self):
+        size = max(1, BLOCK_BYTES // (8 * max(self.num_vars, 1)))
+        for start in range(0, self.num_vars, size):
+            stop = min(start + size, self.num_vars)
+            yield start, stop, self._upper_rows(start, stop)
+
+    def field(self, solutions):
+        """
+        Returns the off-diagonal local field J x (J symmetric) of a solution
+        vector or of each row of an (R, n) batch.
+        """
+        solutions = np.asarray(solutions)
+        vectors = np.atleast_2d(solutions).astype(float)
+        if self.sparse:
+            fields = np.asarray(vectors @ self.upper + vectors @ self.upper.T, dtype=float)
+        else:
+            fields = np.zeros((len(vectors), self.num_vars))
+            for start, stop, block in self._blocks():
+                fields[:, start:stop] += vectors @ block.T
+                fields += vectors[:, start:stop] @ block
+        return fields if solutions.ndim == 2 else fields[0]
+
+    def energies(self, solutions, constant=0.0):
+        """
+        Computes the energy of each row of solutions.
+        """
+        vectors = np.atleast_2d(np.asarray(solutions)).astype(float)
+        energies = vectors @ self.diagonal.astype(float) + constant
+        if self.sparse:
+            energies += np.einsum('ij,ij->i', np.asarray(vectors @ self.upper), vectors)
+        else:
+            for start, stop, block in self._blocks():
+                energies += np.einsum('ij,ij->i', vectors @ block.T, vectors[:, start:stop])
+        return energies
+
+    def energy(self, solution, constant=0.0):
+        return float(self.energies(solution, constant)[0])
+
+    def deltas(self, solution, field=None):
+        """
+        Returns the energy change of flipping each bit of solution, given
+        its off-diagonal local field if already known.
+        """
+        solution = np.asarray(solution)
+        if field is None:
+            field = self.field(solution)
+        return (1 - 2 * solution) * (self.diagonal + field)
+
+    def coupling(self):
+        """
+        Returns Q + Q^T (J off the diagonal, 2 Q_ii on it) as a dense array or
+        CSR matrix in the compact dtype. This expands the matrix; the
+        local-field kernels use add_row and product instead.
+        """
+        diagonal = 2 * self.diagonal
+        if self.sparse:
+            return (self.upper + self.upper.T + sp.diags(diagonal, dtype=self.dtype)).tocsr().astype(self.dtype)
+        coupling = np.zeros(self.shape, dtype=self.dtype)
+        for row in range(self.num_vars - 1):
+            offset = self._row_offset(row)
+            values = self.upper[offset:offset + self.num_vars - row - 1]
+            coupling[row, row + 1:] = values
+            coupling[row + 1:, row] = values
+        coupling[np.diag_indices(self.num_vars)] = diagonal
+        return coupling
+
+    def to_matrix(self):
+        """
+        Returns an upper triangular QUBO matrix with the same energies, in
+        the compact dtype.
+        """
+        if self.sparse:
+            return (self.upper + sp.diags(self.diagonal, dtype=self.dtype)).tocsr().astype(self.dtype)
+        matrix = np.zeros(self.shape, dtype=self.dtype)
+        for row in range(self.num_vars - 1):
+            offset = self._row_offset(row)
+            matrix[row, row + 1:] = self.upper[offset:offset + self.num_vars - row - 1]
+        matrix[np.diag_indices(self.num_vars)] = self.diagonal
+        return matrix
@@ -0,0 +1,99 @@
+# Common stopping rules shared by all solvers: deadline, target energy, stagnation and cancellation
+import threading
+import time
+
+
+class SolverControl:
+    """
+    Tells a running solver when to stop. Solvers call should_stop(best_cost)
+    once per iteration and interrupted() inside long inner loops; both are
+    cheap enough for hot loops.
+
+    A solver stops when:
+        - cancel() was called, e.g. because the client disconnected
+        - the wall-clock deadline (time.time() seconds) has passed
+        - the best cost reached target_energy
+        - the best cost did not improve for stagnation_limit iterations
+
+    The reason is kept in stop_reason. Controls cross process boundaries
+    through for_worker(), which keeps the deadline and target but not the
+    in-process cancellation event; parent processes cancel workers by
+    terminating them.
+    """
+    def __init__(self, time_limit=None, deadline=None, target_energy=None, stagnation_limit=None):
+        if time_limit is not None:
+            limit = time.time() + time_limit
+            deadline = limit if deadline is None else min(deadline, limit)
+        self.deadline = deadline
+        self.target_energy = target_energy
+        self.stagnation_limit = stagnation_limit
+        self.stop_reason = None
+        self._cancel_event = threading.Event()
+        self._best_cost = float('inf')
+        self._stagnant_iterations = 0
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def remaining(self):
+        """Seconds until the deadline, or None without one."""
+        return None if self.deadline is None else self.deadline - time.time()
+
+    def interrupted(self):
+        """
+        Returns True once the solve was cancelled or its deadline passed.
+        """
+        if self._cancel_event.is_set():
+            self.stop_reason = "cancelled"
+            return True
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.stop_reason = "deadline"
+            return True
+        return False
+
+    def should_stop(self, best_cost):
+        """
+        Returns True if the solver should stop after an iteration that ended
+        with best_cost.
+        """
+        if self.interrupted():
+            return True
+        if self.target_energy is not None and best_cost <= self.target_energy:
+            self.stop_reason = "target"
+            return True
+        if self.stagnation_limit is not None:
+            if best_cost < self._best_cost:
+                self._best_cost = best_cost
+                self._stagnant_iterations = 0
+            else:
+                self._stagnant_iterations += 1
+                if self._stagnant_iterations >= self.stagnation_limit:
+                    self.stop_reason = "stagnation"
+                    return True
+        return False
+
+    def for_worker(self):
+        """
+        Returns a picklable control with the same deadline and target for a
+        worker process.
+        """
+        return SolverControl(deadline=self.deadline, target_energy=self.target_energy,
+                             stagnation_limit=self.stagnation_limit)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_cancel_event"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cancel_event = threading.Event()
+
+
+def as_control(control):
+    """Returns control, or a control that never stops for None."""
+    return SolverControl() if control is None else control
@@ -1,6 +1,11 @@
 # Genetic Algorithm Implementation
 import numpy as np
 import time
+from . import instrumentation
+from .bitpack import pack_solutions, packed_crossover, packed_energies, packed_mutate, random_words, unpack_solutions
+from .control import as_control
+from .local_field import as_solution, qubo_energies
+from .progress import ProgressReporter
 
 def compute_cost(qubo_matrix, solution, constant):
     """
@@ -8,44 +13,83 @@ def compute_cost(qubo_matrix, solution, constant):
     """
     return solution @ qubo_matrix @ solution.T + constant
 
-def initialize_population(pop_size, num_vars):
+def compute_population_costs(qubo_matrix, population, constant):
     """
-    Initializes the population with random binary solutions.
+    Computes the cost of every individual with one batched quadratic form.
     """
-    return np.random.randint(0, 2, (pop_size, num_vars))
+    return qubo_energies(qubo_matrix, population, constant)
 
-def select_parents(population, fitness, num_parents):
+def initialize_population(pop_size, num_vars, seeds=None):
     """
-    Selects parents based on fitness-proportional selection (roulette wheel selection).
+    Initializes the population with random binary solutions, the first of
+    which are replaced by the given seed solutions.
     """
-    probabilities = fitness / fitness.sum()
-    selected_indices = np.random.choice(len(population), num_parents, p=probabilities)
+    population = np.random.randint(0, 2, (pop_size, num_vars))
+    if seeds is not None and len(seeds):
+        seeds = np.asarray(seeds, dtype=population.dtype)[:pop_size]
+        population[:len(seeds)] = seeds
+    return population
+
+def initialize_packed_population(pop_size, num_vars, seeds=None):
+    """
+    Packed counterpart of initialize_population, see algorithms.bitpack.
+    """
+    population = random_words(pop_size, num_vars)
+    if seeds is not None and len(seeds):
+        population[:min(len(seeds), pop_size)] = pack_solutions(np.asarray(seeds)[:pop_size])
+    return population
+
+def select_parents(population, costs, num_parents, method='tournament', tournament_size=3):
+    """
+    Selects parents from the population. Lower cost is better and costs may be
+    negative.
+
+    Methods:
+        - tournament: best of tournament_size uniformly drawn individuals
+        - rank: probability proportional to rank, worst individual has rank 1
+        - roulette: probability proportional to cost distance from the worst
+          individual
+    """
+    pop_size = len(population)
+    if method == 'tournament':
+        contestants = np.random.randint(pop_size, size=(num_parents, tournament_size))
+        winners = np.argmin(costs[contestants], axis=1)
+        selected_indices = contestants[np.arange(num_parents), winners]
+    elif method == 'rank':
+        ranks = np.empty(pop_size)
+        ranks[np.argsort(-costs)] = np.arange(1, pop_size + 1)
+        selected_indices = np.random.choice(pop_size, num_parents, p=ranks / ranks.sum())
+    elif method == 'roulette':
+        fitness = costs.max() - costs
+        if fitness.sum() > 0:
+            probabilities = fitness / fitness.sum()
+        else:
+            probabilities = None
+        selected_indices = np.random.choice(pop_size, num_parents, p=probabilities)
+    else:
+        raise ValueError(f"Unknown selection method: {method}")
     return population[selected_indices]
 
 def crossover(parents, num_offspring):
     """
     Performs single-point crossover to generate offspring.
     """
-    num_vars = parents.shape[1]
-    offspring = []
-    for _ in range(num_offspring):
-        parent1, parent2 = parents[np.random.choice(len(parents), 2, replace=False)]
-        crossover_point = np.random.randint(1, num_vars)
-        child = np.concatenate((parent1[:crossover_point], parent2[crossover_point:]))
-        offspring.append(child)
-    return np.array(offspring)
+    num_parents, num_vars = parents.shape
+    first = np.random.randint(num_parents, size=num_offspring)
+    # Offset the second parent so the pair is always distinct
+    second = (first + np.random.randint(1, num_parents, size=num_offspring)) % num_parents
+    crossover_points = np.random.randint(1, num_vars, size=num_offspring)
+    masks = np.arange(num_vars) < crossover_points[:, None]
+    return np.where(masks, parents[first], parents[second])
 
 def mutate(offspring, mutation_rate):
     """
     Performs mutation by flipping bits with a given mutation rate.
     """
-    for individual in offspring:
-        for i in range(len(individual)):
-            if np.random.rand() < mutation_rate:
-                individual[i] = 1 - individual[i]  # Flip the bit
+    offspring ^= np.random.rand(*offspring.shape) < mutation_rate
     return offspring
 
-def genetic_algorithm(qubo_matrix, constant, parameters=None):
+def genetic_algorithm(qubo_matrix, constant, parameters=None, progress=None, control=None):
     """
     Implements the Genetic Algorithm for QUBO optimization.
     
@@ -56,6 +100,18 @@ def genetic_algorithm(qubo_matrix, constant, parameters=None):
             - pop_size: Population size (default: 50)
             - num_generations: Number of generations (default: 100)
             - mutation_rate: Mutation rate (default: 0.01)
+            - selection: Parent selection method, one of "tournament",
+              "rank" or "roulette" (default: "tournament")
+            - tournament_size: Individuals per tournament (default: 3)
+            - initial_population: Solutions seeding the first generation
+              (default: None)
+            - initial_solution: A single seed solution, added in front of
+              initial_population (default: None)
+            - packed: Keep the population bit-packed, 64 variables per
+              uint64 word, and unpack it only to evaluate energies
+              (default: True)
+        progress: Optional ProgressReporter receiving the best cost per generation
+        control: Optional SolverControl checked after every generation
     
     Returns:
         Tuple containing:
@@ -66,48 +122,72 @@ def genetic_algorithm(qubo_matrix, constant, parameters=None):
     """
     if parameters is None:
         parameters = {}
+    if progress is None:
+        progress = ProgressReporter()
+    control = as_control(control)
     
     pop_size = parameters.get('pop_size', 50)
     num_generations = parameters.get('num_generations', 100)
     mutation_rate = parameters.get('mutation_rate', 0.01)
+    selection = parameters.get('selection', 'tournament')
+    tournament_size = parameters.get('tournament_size', 3)
+    packed = parameters.get('packed', True)
     
+    seeds = [as_solution(seed) for seed in parameters.get('initial_population', [])]
+    if parameters.get('initial_solution') is not None:
+        seeds.insert(0, as_solution(parameters['initial_solution']))
+
     num_vars = qubo_matrix.shape[0]
-    population = initialize_population(pop_size, num_vars)
+    if packed:
+        population = initialize_packed_population(pop_size, num_vars, seeds)
+    else:
+        population = initialize_population(pop_size, num_vars, seeds)
     best_solution = None
     best_cost = float('inf')
-    costs_per_generation = []
 
     start_time = time.time()
+    generations_run = 0
 
     for generation in range(num_generations):
-        # Compute fitness (negative cost, because we minimize cost)
-        fitness = -np.array([compute_cost(qubo_matrix, individual, constant) for individual in population])
+        if packed:
+            costs = packed_energies(qubo_matrix, population, num_vars, constant)
+        else:
+            costs = compute_population_costs(qubo_matrix, population, constant)
         
         # Track the best solution
-        current_best_index = np.argmax(fitness)
-        current_best_solution = population[current_best_index]
-        current_best_cost = -fitness[current_best_index]
+        current_best_index = np.argmin(costs)
+        current_best_cost = float(costs[current_best_index])
 
         if current_best_cost < best_cost:
-            best_solution = current_best_solution
+            if packed:
+                best_solution = unpack_solutions(population[current_best_index], num_vars)[0]
+            else:
+                best_solution = population[current_best_index].copy()
             best_cost = current_best_cost
 
         # Store the best cost for this generation
-        costs_per_generation.append(best_cost)
+        progress.record(best_cost)
+        generations_run = generation + 1
+        if control.should_stop(best_cost):
+            break
 
         # Selection
-        parents = select_parents(population, fitness, pop_size // 2)
+        parents = select_parents(population, costs, pop_size // 2, selection, tournament_size)
 
-        # Crossover
-        offspring = crossover(parents, pop_size - len(parents))
-
-        # Mutation
-        offspring = mutate(offspring, mutation_rate)
+        # Crossover and mutation
+        if packed:
+            offspring = packed_crossover(parents, num_vars, pop_size - len(parents))
+            offspring = packed_mutate(offspring, num_vars, mutation_rate)
+        else:
+            offspring = crossover(parents, pop_size - len(parents))
+            offspring = mutate(offspring, mutation_rate)
 
         # Create new population
         population = np.vstack((parents, offspring))
 
+    instrumentation.count("energy_evaluations", generations_run * pop_size, solver="genetic-algorithm")
+
     end_time = time.time()
     elapsed_time = end_time - start_time
 
-    return best_solution, best_cost, costs_per_generation, elapsed_time
\ No newline at end of file
+    return best_solution, best_cost, progress.costs, elapsed_time
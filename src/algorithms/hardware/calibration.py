@@ -0,0 +1,189 @@
+# Measured solver timings used to predict computation time and cost
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Per-user data directory, so the file does not depend on the working directory
+DATA_DIR = os.environ.get(
+    "QUBO_DATA_DIR",
+    os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share"), "qubo")
+)
+CALIBRATION_PATH = os.environ.get("QUBO_CALIBRATION", os.path.join(DATA_DIR, "calibration.json"))
+
+# Measurements are written out once this many are pending or the last write
+# is this many seconds old, rather than after every solve
+SAVE_EVERY = 32
+SAVE_INTERVAL = 60.0
+
+# Later measurements keep at least this weight in a bucket's running mean
+MIN_SAMPLE_WEIGHT = 0.01
+
+
+def matrix_density(qubo_matrix) -> float:
+    """
+    Fraction of nonzero entries of a dense, scipy.sparse or compact QUBO
+    matrix, counting a compact coupling for both triangles.
+    """
+    num_vars = qubo_matrix.shape[0]
+    if num_vars == 0:
+        return 0.0
+    if hasattr(qubo_matrix, "upper"):
+        upper = qubo_matrix.upper
+        off_diagonal = upper.nnz if sp.issparse(upper) else np.count_nonzero(upper)
+        nonzeros = 2 * off_diagonal + np.count_nonzero(qubo_matrix.diagonal)
+    elif sp.issparse(qubo_matrix):
+        nonzeros = qubo_matrix.nnz
+    else:
+        nonzeros = np.count_nonzero(qubo_matrix)
+    return float(nonzeros) / (num_vars * num_vars)
+
+
+def _bucket(value: float) -> float:
+    # Nearest power of two, so sizes and densities within ~41% share a bucket
+    return float(2.0 ** round(math.log2(value))) if value > 0 else 0.0
+
+
+def _work(num_vars: float, density: float) -> float:
+    # Nonzeros of the matrix, at least one per row
+    return num_vars * max(density * num_vars, 1.0)
+
+
+class CostModel:
+    """
+    Per-iteration solver timings measured on this machine, bucketed by
+    solver, problem size and density (each rounded to a power of two) and
+    kept in a JSON file so that they survive restarts.
+
+    A bucket holds the running mean of the seconds per iteration of the
+    solves that fell into it. Predictions for an unmeasured bucket take the
+    nearest measured bucket of the same solver and scale it by the number of
+    nonzeros of the matrix.
+
+    New measurements take effect in memory at once and are written out in
+    batches (see SAVE_EVERY and SAVE_INTERVAL) or by flush(). A write locks
+    the file, applies the pending measurements to its current contents, so
+    that processes sharing it do not lose each other's, and replaces it
+    atomically.
+    """
+    def __init__(self, path: str = CALIBRATION_PATH, save_every: int = SAVE_EVERY,
+                 save_interval: float = SAVE_INTERVAL):
+        self.path = path
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self.buckets = self._load()
+        self._pending: Dict[str, Tuple[Dict[str, float], List[float]]] = {}
+        self._last_save = time.monotonic()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, buckets):
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(buckets, f)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _key(solver_type: str, num_vars: int, density: float) -> str:
+        return f"{solver_type}:{_bucket(num_vars):g}:{_bucket(density):g}"
+
+    @staticmethod
+    def _add_sample(buckets, key: str, bucket: Dict[str, float], value: float):
+        bucket = dict(buckets.get(key) or {**bucket, "samples": 0, "seconds_per_iteration": 0.0})
+        bucket["samples"] += 1
+        weight = max(1.0 / bucket["samples"], MIN_SAMPLE_WEIGHT)
+        bucket["seconds_per_iteration"] += weight * (value - bucket["seconds_per_iteration"])
+        buckets[key] = bucket
+
+    def record(self, solver_type: str, num_vars: int, density: float, iterations: int, seconds: float):
+        """
+        Adds a measured solve of iterations iterations taking seconds, and
+        writes pending measurements out if a batch is due.
+        """
+        if iterations <= 0 or seconds <= 0:
+            return
+        key = self._key(solver_type, num_vars, density)
+        bucket = {"solver_type": solver_type, "num_vars": _bucket(num_vars), "density": _bucket(density)}
+        with self._lock:
+            self._add_sample(self.buckets, key, bucket, seconds / iterations)
+            self._pending.setdefault(key, (bucket, []))[1].append(seconds / iterations)
+            pending = sum(len(values) for _, values in self._pending.values())
+            due = pending >= self.save_every or time.monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the pending measurements to the file, merged into its current
+        contents. Failures are ignored; the measurements stay pending.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(f"{self.path}.lock", "a") as lock_file:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    buckets = self._load()
+                    for key, (bucket, values) in self._pending.items():
+                        for value in values:
+                            self._add_sample(buckets, key, bucket, value)
+                    self._save(buckets)
+            except OSError:
+                return
+            self.buckets = buckets
+            self._pending = {}
+            self._last_save = time.monotonic()
+
+    def seconds_per_iteration(self, solver_type: str, num_vars: int, density: float) -> Optional[float]:
+        """
+        Predicts the seconds per iteration of solver_type, or None if the
+        solver was never measured.
+        """
+        with self._lock:
+            bucket = self.buckets.get(self._key(solver_type, num_vars, density))
+            if bucket is not None:
+                return bucket["seconds_per_iteration"]
+            measured = [b for b in self.buckets.values() if b["solver_type"] == solver_type]
+        if not measured:
+            return None
+        size, density = max(num_vars, 1), max(density, 1e-12)
+        nearest = min(measured, key=lambda b: abs(math.log2(b["num_vars"] / size))
+                      + abs(math.log2(max(b["density"], 1e-12) / density)))
+        scale = _work(size, density) / _work(nearest["num_vars"], nearest["density"])
+        return nearest["seconds_per_iteration"] * scale
+
+
+_cost_model = None
+_cost_model_lock = threading.Lock()
+
+
+def get_cost_model() -> CostModel:
+    """
+    Returns the process-wide CostModel, loading it on first use. Pending
+    measurements are flushed at interpreter exit; worker processes that end
+    with os._exit must call flush() themselves.
+    """
+    global _cost_model
+    with _cost_model_lock:
+        if _cost_model is None:
+            _cost_model = CostModel()
+            atexit.register(_cost_model.flush)
+        return _cost_model
@@ -1,17 +1,132 @@
+import multiprocessing
+import re
+import signal
+import sys
+import threading
 import numpy as np
+import scipy.sparse as sp
 import time
-from typing import Dict, Any, Tuple, List
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple, List, Union, Optional
 import logging
+from threadpoolctl import threadpool_limits
+from .. import instrumentation
+from ..control import SolverControl, as_control
+from ..progress import ProgressReporter
+from .calibration import CostModel, get_cost_model, matrix_density
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+MEMORY_UNITS = {"": 1, "B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30, "TB": 1 << 40}
+
+# Seconds between checks for cancellation while an isolated worker runs
+WORKER_POLL_INTERVAL = 0.1
+
+# Seconds a cancelled worker gets to return its best solution before it is terminated
+CANCEL_GRACE_PERIOD = 1.0
+
+
+def parse_memory(memory) -> int:
+    """
+    Converts a memory spec such as "4GB", "512 MB" or a number of bytes to
+    bytes. Units are binary (1 GB = 2^30 bytes).
+    """
+    if isinstance(memory, (int, float)):
+        return int(memory)
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([KMGT]?B?)\s*", str(memory).upper())
+    if match is None:
+        raise ValueError(f"Invalid memory spec: {memory}")
+    return int(float(match.group(1)) * MEMORY_UNITS[match.group(2)])
+
+
+@contextmanager
+def limit_threads(cores: int):
+    """
+    Limits the BLAS/OpenMP thread pools, and torch's if it is loaded, to
+    cores threads while the block runs. The pools are resized through
+    threadpoolctl, which also works after NumPy has started them.
+    """
+    torch = sys.modules.get("torch")
+    torch_threads = torch.get_num_threads() if torch is not None else None
+    if torch is not None:
+        torch.set_num_threads(cores)
+    try:
+        with threadpool_limits(limits=cores):
+            yield
+    finally:
+        if torch is not None:
+            torch.set_num_threads(torch_threads)
+
+
+def _run_isolated(connection, cancel_event, solver_func, qubo_matrix, attach, constant, solver_params, control,
+                  cores, memory_bytes, seed, progress_interval, keep_trace):
+    """
+    Worker process entry point: applies the thread and memory limits, runs
+    the solver and sends progress snapshots and then the result with the
+    solve's instrumentation metrics, or the error, through connection.
+    Setting cancel_event cancels the control. With attach, qubo_matrix is a
+    shared-matrix descriptor that attach maps.
+    """
+    # Turn SIGTERM into SystemExit so solvers with worker pools of their own clean them up
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    # Started before the memory limit applies, which would count its stack
+    threading.Thread(target=lambda: cancel_event.wait() and control.cancel(), daemon=True).start()
+    if resource is not None and memory_bytes is not None:
+        _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+        if hard_limit != resource.RLIM_INFINITY:
+            memory_bytes = min(memory_bytes, hard_limit)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard_limit))
+    np.random.seed(seed)
+    if attach is not None:
+        # The segments must stay referenced while the matrix is in use
+        qubo_matrix, segments = attach(qubo_matrix)
+
+    progress = ProgressReporter(
+        callback=lambda snapshot: connection.send(("progress", snapshot)),
+        interval=progress_interval, keep_trace=keep_trace
+    )
+    try:
+        with instrumentation.profile() as metrics, limit_threads(cores):
+            result = solver_func(qubo_matrix, constant, solver_params, progress=progress, control=control)
+        connection.send(("result", (result, progress.snapshot(), control.stop_reason, metrics.state())))
+    except MemoryError:
+        connection.send(("error", f"Solver exceeded the memory limit of {memory_bytes} bytes"))
+    except Exception as e:
+        connection.send(("error", str(e)))
+    finally:
+        connection.close()
+
 
 class HardwareExecutor:
     """
     Manages hardware resource allocation and execution for QUBO optimization.
+
+    On the CPU provider the solver's BLAS/OpenMP thread pools are limited to
+    specs["cores"] threads. Unless specs["isolated"] is False the solver runs
+    in a separate worker process whose address space is limited to
+    specs["memory"]. With a shared_matrix class (see
+    backend.workers.SharedMatrix) the worker maps the matrix instead of
+    receiving a pickled copy. Progress reaches the caller's reporter through
+    a pipe, the worker's instrumentation metrics are merged into the
+    caller's, and cancelling the control terminates the worker.
+
+    Every CPU solve records its time per iteration in the cost model (see
+    calibration.CostModel), from which estimate_cost predicts.
     """
-    def __init__(self, hardware_config: Dict[str, Any]):
+    def __init__(self, hardware_config: Dict[str, Any], cost_model: Optional[CostModel] = None,
+                 process_context=None, shared_matrix=None):
         self.provider_type = hardware_config.get("provider_type", "CPU")
         self.specs = hardware_config.get("specs", {})
         self.cost_per_hour = float(hardware_config.get("cost_per_hour", 0.0))
         self._validate_config()
+        self.cost_model = cost_model if cost_model is not None else get_cost_model()
+        # Multiprocessing context for isolated workers, ideally a fork server with the solvers preloaded
+        self.process_context = process_context
+        # Shares dense and CSR matrices with isolated workers; others are pickled
+        self.shared_matrix = shared_matrix
         
     def _validate_config(self):
         """Validates hardware configuration."""
@@ -29,15 +144,32 @@ class HardwareExecutor:
             if spec not in self.specs:
                 raise ValueError(f"Missing required spec for {self.provider_type}: {spec}")
 
-    def estimate_cost(self, problem_size: int, max_iterations: int) -> float:
+        if self.provider_type == "CPU":
+            self.cores = int(self.specs["cores"])
+            if self.cores < 1:
+                raise ValueError("CPU cores must be at least 1")
+            self.memory_bytes = parse_memory(self.specs["memory"])
+            self.isolated = bool(self.specs.get("isolated", True))
+
+    def estimate_cost(self, problem_size: int, max_iterations: int,
+                      solver_type: Optional[str] = None, density: float = 1.0) -> float:
         """Estimates cost for running the optimization."""
         # Base computation time estimation (in hours)
-        base_time = self._estimate_computation_time(problem_size, max_iterations)
+        base_time = self._estimate_computation_time(problem_size, max_iterations, solver_type, density)
         return base_time * self.cost_per_hour
 
-    def _estimate_computation_time(self, problem_size: int, max_iterations: int) -> float:
-        """Estimates computation time in hours based on problem parameters."""
-        # Basic estimation model - can be refined based on benchmarks
+    def _estimate_computation_time(self, problem_size: int, max_iterations: int,
+                                   solver_type: Optional[str] = None, density: float = 1.0) -> float:
+        """
+        Estimates computation time in hours. On CPU, measured timings of
+        solver_type are used when there are any; otherwise, and for other
+        providers, a fixed scaling model.
+        """
+        if self.provider_type == "CPU" and solver_type is not None:
+            seconds_per_iteration = self.cost_model.seconds_per_iteration(solver_type, problem_size, density)
+            if seconds_per_iteration is not None:
+                return seconds_per_iteration * max_iterations / 3600
+
         if self.provider_type == "CPU":
             time_per_iteration = problem_size ** 2 * 1e-6  # microseconds
         elif self.provider_type == "GPU":
@@ -50,17 +182,24 @@ class HardwareExecutor:
 
     def execute(self, 
                 solver_func: callable, 
-                qubo_matrix: np.ndarray,
+                qubo_matrix: Union[np.ndarray, sp.spmatrix],
                 solver_params: Dict[str, Any],
-                constant: float = 0.0) -> Tuple[np.ndarray, float, List[float], float]:
+                constant: float = 0.0,
+                progress: Optional[ProgressReporter] = None,
+                control: Optional[SolverControl] = None,
+                solver_type: Optional[str] = None) -> Tuple[np.ndarray, float, List[float], float]:
         """
         Executes the optimization on the specified hardware.
         
         Args:
             solver_func: The solver function to execute
-            qubo_matrix: The QUBO matrix
+            qubo_matrix: The QUBO matrix, dense or scipy.sparse
             solver_params: Solver-specific parameters
             constant: Constant term in QUBO formulation
+            progress: Optional ProgressReporter passed on to the solver
+            control: Optional SolverControl passed on to the solver
+            solver_type: Name under which timings are recorded in the cost
+                model (default: the solver function's name)
             
         Returns:
             Tuple containing:
@@ -76,21 +215,39 @@ class HardwareExecutor:
         
         try:
             # Execute the solver
-            if self.provider_type == "GPU":
+            if self.provider_type == "GPU" and sp.issparse(qubo_matrix):
+                # Sparse kernels run on the host; keep the CSR matrix in place
+                logging.info("Sparse QUBO matrix, executing GPU job on CPU")
+                result = solver_func(qubo_matrix, constant, solver_params, progress=progress, control=control)
+            elif self.provider_type == "GPU":
                 # Move data to GPU if available
                 try:
                     import cupy as cp
                     qubo_matrix = cp.array(qubo_matrix)
-                    result = solver_func(qubo_matrix, constant, solver_params)
+                    result = solver_func(qubo_matrix, constant, solver_params, progress=progress, control=control)
                     # Move results back to CPU
                     result = tuple(cp.asnumpy(r) if isinstance(r, cp.ndarray) else r 
                                  for r in result)
                 except ImportError:
                     logging.warning("CUDA not available, falling back to CPU execution")
-                    result = solver_func(qubo_matrix, constant, solver_params)
+                    result = solver_func(qubo_matrix, constant, solver_params, progress=progress, control=control)
             else:
                 # CPU execution
-                result = solver_func(qubo_matrix, constant, solver_params)
+                if progress is None:
+                    progress = ProgressReporter()
+                if self.isolated:
+                    result, iterations = self._execute_isolated(
+                        solver_func, qubo_matrix, solver_params, constant, progress, control
+                    )
+                else:
+                    iterations = progress.iterations
+                    with limit_threads(self.cores):
+                        result = solver_func(qubo_matrix, constant, solver_params, progress=progress, control=control)
+                    iterations = progress.iterations - iterations
+                self.cost_model.record(
+                    solver_type or getattr(solver_func, "__name__", "solver"),
+                    qubo_matrix.shape[0], matrix_density(qubo_matrix), iterations, result[3]
+                )
             
             execution_time = time.time() - start_time
             
@@ -102,4 +259,72 @@ class HardwareExecutor:
             
         except Exception as e:
             logging.error(f"Execution failed: {str(e)}")
-            raise RuntimeError(f"Hardware execution failed: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Hardware execution failed: {str(e)}")
+
+    def _execute_isolated(self, solver_func, qubo_matrix, solver_params, constant, progress, control):
+        """
+        Runs the solver in a worker process with the CPU limits applied.
+        Returns the solver's result and the number of iterations it ran.
+        """
+        control = as_control(control)
+        context = self.process_context
+        if context is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            context = multiprocessing.get_context(method)
+        receiver, sender = context.Pipe(duplex=False)
+        cancel_event = context.Event()
+        # Drawn from the caller's generator so seeded solves stay reproducible
+        seed = np.random.randint(2 ** 32)
+        shared, attach = None, None
+        if self.shared_matrix is not None and (isinstance(qubo_matrix, np.ndarray) or sp.issparse(qubo_matrix)):
+            shared = self.shared_matrix(qubo_matrix)
+            qubo_matrix, attach = shared.descriptor, self.shared_matrix.attach
+        process = context.Process(
+            target=_run_isolated,
+            args=(sender, cancel_event, solver_func, qubo_matrix, attach, constant, solver_params,
+                  control.for_worker(), self.cores, self.memory_bytes, seed, progress.interval,
+                  progress.keep_trace)
+        )
+        try:
+            process.start()
+        except BaseException:
+            if shared is not None:
+                shared.close()
+            raise
+        sender.close()
+
+        cancel_deadline = None
+        try:
+            while True:
+                if control.cancelled and cancel_deadline is None:
+                    # Let the solver return its best solution before terminating it
+                    cancel_event.set()
+                    cancel_deadline = time.time() + CANCEL_GRACE_PERIOD
+                if cancel_deadline is not None and time.time() >= cancel_deadline:
+                    control.stop_reason = "cancelled"
+                    raise RuntimeError("Solve cancelled")
+                if not receiver.poll(WORKER_POLL_INTERVAL):
+                    continue
+                try:
+                    kind, payload = receiver.recv()
+                except EOFError:
+                    process.join()
+                    raise RuntimeError(f"Solver worker exited with code {process.exitcode}")
+                if kind == "progress":
+                    progress.forward(payload)
+                elif kind == "error":
+                    raise RuntimeError(payload)
+                else:
+                    result, snapshot, stop_reason, metrics = payload
+                    instrumentation.merge(metrics)
+                    progress.forward(snapshot)
+                    if stop_reason is not None:
+                        control.stop_reason = stop_reason
+                    return result, snapshot["iteration"]
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            if shared is not None:
+                shared.close()
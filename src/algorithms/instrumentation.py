@@ -0,0 +1,215 @@
+# Lightweight solver instrumentation: phase timers, counters and memory high-water marks
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# 0: disabled, 1: timers and counters, 2: additionally log every phase at DEBUG level
+VERBOSITY = int(os.environ.get("QUBO_INSTRUMENTATION", 1))
+
+
+def set_verbosity(level):
+    global VERBOSITY
+    VERBOSITY = level
+
+
+def peak_rss_bytes():
+    """
+    Returns the process's resident-set high-water mark in bytes, or 0 where
+    it is unavailable.
+    """
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Metrics:
+    """
+    Accumulates phase timings and event counts. Keys are (name, labels) pairs
+    with labels a sorted tuple of (key, value) items.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phases = {}
+        self.counters = {}
+        self.peak_rss = 0
+
+    def add_phase(self, key, seconds):
+        with self._lock:
+            calls, total = self.phases.get(key, (0, 0.0))
+            self.phases[key] = (calls + 1, total + seconds)
+
+    def add_count(self, key, amount):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe_memory(self):
+        self.peak_rss = max(self.peak_rss, peak_rss_bytes())
+
+    def state(self):
+        """
+        Returns (phases, counters, peak_rss) as plain picklable values, for
+        sending the metrics of a worker process to its parent.
+        """
+        with self._lock:
+            return dict(self.phases), dict(self.counters), self.peak_rss
+
+    def merge(self, state, include_memory=True):
+        """
+        Adds the phases and counters of a state() taken elsewhere and, with
+        include_memory, takes the larger of the two peak RSS values.
+        """
+        phases, counters, peak_rss = state
+        with self._lock:
+            for key, (calls, total) in phases.items():
+                own_calls, own_total = self.phases.get(key, (0, 0.0))
+                self.phases[key] = (own_calls + calls, own_total + total)
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            if include_memory:
+                self.peak_rss = max(self.peak_rss, peak_rss)
+
+    def report(self):
+        """
+        Returns the metrics as a JSON-serializable dictionary.
+        """
+        def name(key):
+            metric, labels = key
+            if not labels:
+                return metric
+            return metric + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+        with self._lock:
+            return {
+                "phases": {
+                    name(key): {"calls": calls, "seconds": total}
+                    for key, (calls, total) in self.phases.items()
+                },
+                "counters": {name(key): value for key, value in self.counters.items()},
+                "peak_rss_bytes": self.peak_rss
+            }
+
+
+# Process-wide totals, exposed by /api/metrics
+GLOBAL_METRICS = Metrics()
+
+# Metrics of the solve running in the current context, if profiled
+_active_profile = contextvars.ContextVar("qubo_profile", default=None)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+@contextmanager
+def phase(name, **labels):
+    """
+    Times a block of work under the given phase name.
+    """
+    if VERBOSITY <= 0:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        key = _key(name, labels)
+        GLOBAL_METRICS.add_phase(key, elapsed)
+        GLOBAL_METRICS.observe_memory()
+        active = _active_profile.get()
+        if active is not None:
+            active.add_phase(key, elapsed)
+            active.observe_memory()
+        if VERBOSITY >= 2:
+            logging.debug(f"Phase {name} {labels or ''} took {elapsed:.6f}s")
+
+
+def count(name, amount=1, **labels):
+    """
+    Adds amount to an event counter. Hot loops should count locally and call
+    this once per batch.
+    """
+    if VERBOSITY <= 0:
+        return
+    key = _key(name, labels)
+    GLOBAL_METRICS.add_count(key, amount)
+    active = _active_profile.get()
+    if active is not None:
+        active.add_count(key, amount)
+
+
+@contextmanager
+def profile():
+    """
+    Collects the metrics of the enclosed solve into a separate Metrics
+    object, in addition to the process-wide totals.
+    """
+    metrics = Metrics()
+    token = _active_profile.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _active_profile.reset(token)
+
+
+def merge(state):
+    """
+    Adds the Metrics.state() of a solve that ran in a worker process to the
+    process-wide totals and to the active profile. The worker's peak RSS
+    only counts towards the profile; the totals describe this process.
+    """
+    if VERBOSITY <= 0:
+        return
+    GLOBAL_METRICS.merge(state, include_memory=False)
+    active = _active_profile.get()
+    if active is not None:
+        active.merge(state)
+
+
+def prometheus_text(metrics=GLOBAL_METRICS):
+    """
+    Renders metrics in the Prometheus text exposition format.
+    """
+    def labels_text(labels):
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+    lines = [
+        "# HELP qubo_phase_seconds_total Time spent in instrumented solver phases.",
+        "# TYPE qubo_phase_seconds_total counter"
+    ]
+    with metrics._lock:
+        phases = dict(metrics.phases)
+        counters = dict(metrics.counters)
+    for (name, labels), (calls, total) in sorted(phases.items()):
+        lines.append(f"qubo_phase_seconds_total{labels_text((('phase', name),) + labels)} {total}")
+    lines += [
+        "# HELP qubo_phase_calls_total Number of times each solver phase ran.",
+        "# TYPE qubo_phase_calls_total counter"
+    ]
+    for (name, labels), (calls, total) in sorted(phases.items()):
+        lines.append(f"qubo_phase_calls_total{labels_text((('phase', name),) + labels)} {calls}")
+    by_name = {}
+    for (name, labels), value in sorted(counters.items()):
+        by_name.setdefault(name, []).append((labels, value))
+    for name, series in by_name.items():
+        lines.append(f"# TYPE qubo_{name}_total counter")
+        lines.extend(f"qubo_{name}_total{labels_text(labels)} {value}" for labels, value in series)
+    lines += [
+        "# HELP qubo_peak_rss_bytes Resident-set high-water mark of the server process.",
+        "# TYPE qubo_peak_rss_bytes gauge",
+        f"qubo_peak_rss_bytes {max(metrics.peak_rss, peak_rss_bytes())}"
+    ]
+    return "\n".join(lines) + "\n"
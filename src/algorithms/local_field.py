@@ -0,0 +1,193 @@
+# Incremental local-field state for single-bit-flip QUBO search
+import warnings
+import numpy as np
+import scipy.sparse as sp
+from .compact import BLOCK_BYTES, CompactQUBO, add_coupling_row, coupling_product
+
+
+def symmetric_coupling(qubo_matrix):
+    """
+    Returns (Q + Q^T, diag(Q)) for a dense or scipy.sparse QUBO matrix.
+    Sparse input yields a CSR coupling matrix so rows can be read in O(nnz).
+    A CompactQUBO is returned as the coupling itself; the kernels read its
+    rows from the packed triangle without expanding it.
+    """
+    if isinstance(qubo_matrix, CompactQUBO):
+        return qubo_matrix, qubo_matrix.diagonal.astype(float)
+    if sp.issparse(qubo_matrix):
+        qubo_matrix = qubo_matrix.astype(float)
+        return (qubo_matrix + qubo_matrix.T).tocsr(), qubo_matrix.diagonal()
+    qubo_matrix = np.asarray(qubo_matrix, dtype=float)
+    return qubo_matrix + qubo_matrix.T, np.diag(qubo_matrix).copy()
+
+
+def qubo_energies(qubo_matrix, solutions, constant=0.0):
+    """
+    Computes x^T Q x + constant for each row of solutions, for dense or
+    sparse Q, with one batched product.
+    """
+    if isinstance(qubo_matrix, CompactQUBO):
+        return qubo_matrix.energies(solutions, constant)
+    return np.einsum('ij,ij->i', np.asarray(solutions @ qubo_matrix), solutions) + constant
+
+
+class LocalField:
+    """
+    Maintains the energy of a binary solution together with the local field
+    h = (Q + Q^T) x, so that the energy change of flipping any bit can be read
+    in O(1) and an accepted flip is applied in O(n).
+
+    The energy change of flipping bit i is
+        delta_i = Q_ii + (1 - 2 x_i) * h_i
+    which holds for non-symmetric matrices as well.
+    """
+    def __init__(self, qubo_matrix, solution, constant=0.0):
+        self.coupling, self.diagonal = symmetric_coupling(qubo_matrix)
+        self.sparse = sp.issparse(self.coupling)
+        self.solution = np.array(solution, dtype=np.int64)
+        self.field = coupling_product(self.coupling, self.solution)
+        self.energy = float(qubo_energies(qubo_matrix, self.solution[None, :], constant)[0])
+
+    def copy(self):
+        """
+        Returns a state with its own solution and field that shares the
+        coupling matrix with this one.
+        """
+        state = object.__new__(LocalField)
+        state.coupling = self.coupling
+        state.diagonal = self.diagonal
+        state.sparse = self.sparse
+        state.solution = self.solution.copy()
+        state.field = self.field.copy()
+        state.energy = self.energy
+        return state
+
+    def update_entries(self, changes):
+        """
+        Adds change to Q[row, col] for each (row, col, change) and updates
+        the coupling, local field and energy in O(1) per entry, plus a
+        structure change when a sparse coupling gains a nonzero. The
+        coupling is modified in place, so copies sharing it see the change;
+        a compact or reduced-precision coupling is first replaced by a
+        float64 matrix.
+        """
+        if isinstance(self.coupling, CompactQUBO):
+            self.coupling = self.coupling.coupling()
+            self.sparse = sp.issparse(self.coupling)
+        if self.coupling.dtype != np.float64:
+            self.coupling = self.coupling.astype(float)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", sp.SparseEfficiencyWarning)
+            for row, col, change in changes:
+                x_row, x_col = self.solution[row], self.solution[col]
+                if row == col:
+                    self.diagonal[row] += change
+                    self.coupling[row, row] += 2 * change
+                    self.field[row] += 2 * change * x_row
+                    self.energy += change * x_row
+                else:
+                    self.coupling[row, col] += change
+                    self.coupling[col, row] += change
+                    self.field[row] += change * x_col
+                    self.field[col] += change * x_row
+                    self.energy += change * x_row * x_col
+
+    def delta(self, index):
+        """
+        Returns the energy change of flipping a single bit.
+        """
+        sign = 1 - 2 * self.solution[index]
+        return self.diagonal[index] + sign * self.field[index]
+
+    def deltas(self):
+        """
+        Returns the energy change of flipping each bit, as a vector.
+        """
+        return self.diagonal + (1 - 2 * self.solution) * self.field
+
+    def flip(self, index, delta=None):
+        """
+        Flips a single bit and updates the local field and energy in O(n),
+        or O(nnz of the row) for sparse matrices.
+        """
+        if delta is None:
+            delta = self.delta(index)
+        sign = 1 - 2 * self.solution[index]
+        self.solution[index] += sign
+        add_coupling_row(self.coupling, self.field, index, sign)
+        self.energy += float(delta)
+
+
+def initial_local_field(qubo_matrix, initial_solution, constant=0.0):
+    """
+    Returns the LocalField a solver starts from: a copy of initial_solution
+    if it is a LocalField already, a state built from it if it is a
+    solution vector, or a random solution if it is None.
+    """
+    if isinstance(initial_solution, LocalField):
+        return initial_solution.copy()
+    if initial_solution is None:
+        initial_solution = np.random.randint(0, 2, qubo_matrix.shape[0])
+    return LocalField(qubo_matrix, as_solution(initial_solution), constant)
+
+
+def as_solution(initial_solution):
+    """
+    Returns initial_solution as a 0/1 vector; LocalField states yield their
+    current solution.
+    """
+    if isinstance(initial_solution, LocalField):
+        return initial_solution.solution.copy()
+    return np.asarray(initial_solution, dtype=np.int64)
+
+
+class ReplicaLocalField:
+    """
+    Local-field state for R independent solutions stored as one (R, n) array.
+    Proposals and flips are applied to all replicas at once.
+    """
+    def __init__(self, qubo_matrix, solutions, constant=0.0):
+        self.coupling, self.diagonal = symmetric_coupling(qubo_matrix)
+        self.sparse = sp.issparse(self.coupling)
+        # Replicas per dense update, bounding the gathered coupling rows to BLOCK_BYTES
+        self._chunk = max(1, BLOCK_BYTES // (8 * max(self.coupling.shape[0], 1)))
+        self.solutions = np.array(solutions, dtype=np.int64)
+        self.fields = coupling_product(self.coupling, self.solutions)
+        self.energies = qubo_energies(qubo_matrix, self.solutions, constant)
+        self.rows = np.arange(len(self.solutions))
+
+    def deltas_at(self, indices):
+        """
+        Returns the energy change of flipping bit indices[r] in replica r.
+        """
+        signs = 1 - 2 * self.solutions[self.rows, indices]
+        return self.diagonal[indices] + signs * self.fields[self.rows, indices]
+
+    def flip(self, rows, indices, deltas):
+        """
+        Flips bit indices[k] in replica rows[k] for each k, updating the
+        local fields and energies in O(n) (O(nnz of the row) for sparse
+        couplings) per flipped replica. Dense and CSR couplings update all
+        flipped replicas with one NumPy operation, dense ones in chunks of
+        at most BLOCK_BYTES of gathered rows.
+        """
+        signs = 1 - 2 * self.solutions[rows, indices]
+        self.solutions[rows, indices] += signs
+        if isinstance(self.coupling, CompactQUBO):
+            for row, index, sign in zip(rows.tolist(), indices.tolist(), signs.tolist()):
+                self.coupling.add_row(self.fields[row], index, sign)
+        elif self.sparse:
+            # Entries of the flipped CSR rows, gathered once through indptr
+            starts = self.coupling.indptr[indices]
+            lengths = self.coupling.indptr[indices + 1] - starts
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            entries = offsets + np.arange(offsets.size)
+            np.add.at(self.fields, (np.repeat(rows, lengths), self.coupling.indices[entries]),
+                      np.repeat(signs, lengths) * self.coupling.data[entries])
+        elif len(rows) <= self._chunk:
+            self.fields[rows] += signs[:, None] * self.coupling[indices]
+        else:
+            for start in range(0, len(rows), self._chunk):
+                stop = start + self._chunk
+                self.fields[rows[start:stop]] += signs[start:stop, None] * self.coupling[indices[start:stop]]
+        self.energies[rows] += deltas
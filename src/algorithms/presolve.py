@@ -0,0 +1,150 @@
+# QUBO presolve: fixes variables whose optimal value is implied by first-order persistency
+import numpy as np
+import scipy.sparse as sp
+from .compact import BLOCK_BYTES
+
+
+class PresolveResult:
+    """
+    Reduced QUBO over the variables presolve could not fix.
+
+    Attributes:
+        matrix: QUBO matrix over the free variables, with the couplings to
+            fixed variables folded into its diagonal
+        constant: Constant term including the fixed variables' contribution
+        free: Indices of the free variables in the original problem
+        fixed_values: Original-length solution holding the fixed values
+            (free positions are 0)
+    """
+    def __init__(self, matrix, constant, free, fixed_values):
+        self.matrix = matrix
+        self.constant = constant
+        self.free = free
+        self.fixed_values = fixed_values
+
+    @property
+    def num_fixed(self):
+        return len(self.fixed_values) - len(self.free)
+
+    def expand(self, reduced_solution):
+        """
+        Returns the original-length solution for a solution of the reduced
+        problem.
+        """
+        solution = self.fixed_values.copy()
+        solution[self.free] = np.asarray(reduced_solution, dtype=np.int64)
+        return solution
+
+
+def _dense_bounds(qubo_matrix):
+    """
+    Returns diag(Q) and the sums of the negative and positive couplings of
+    each variable, reading J = Q + Q^T a block of rows at a time.
+    """
+    num_vars = qubo_matrix.shape[0]
+    diagonal = np.asarray(np.diag(qubo_matrix), dtype=float).copy()
+    negative = np.empty(num_vars)
+    positive = np.empty(num_vars)
+    block = max(1, BLOCK_BYTES // (8 * max(num_vars, 1)))
+    for start in range(0, num_vars, block):
+        rows = _dense_coupling_rows(qubo_matrix, np.arange(start, min(start + block, num_vars)))
+        negative[start:start + len(rows)] = np.minimum(rows, 0).sum(axis=1)
+        positive[start:start + len(rows)] = np.maximum(rows, 0).sum(axis=1)
+    return diagonal, negative, positive
+
+
+def _dense_coupling_rows(qubo_matrix, indices):
+    # Rows of J = Q + Q^T with the diagonal removed, as float64
+    rows = np.asarray(qubo_matrix[indices], dtype=float) + qubo_matrix[:, indices].T
+    rows[np.arange(len(indices)), indices] = 0
+    return rows
+
+
+def presolve(qubo_matrix, constant=0.0, max_rounds=100):
+    """
+    Fixes variables whose value is the same in some optimal solution, and
+    folds them into the constant and the remaining linear terms.
+
+    With J = Q + Q^T off the diagonal, flipping x_i from 0 to 1 changes the
+    energy by Q_ii + sum_j J_ij x_j. If that change is >= 0 for every
+    assignment of the other free variables, x_i = 0 is optimal; if it is
+    <= 0 for every assignment, x_i = 1 is. The bounds are recomputed after
+    each round of fixing until nothing changes or max_rounds is reached.
+
+    Dense matrices are read a block of rows at a time and the bounds are
+    then updated only for the couplings of newly fixed variables, so no
+    n x n temporary is made and memory-mapped matrices stay on disk. If
+    nothing can be fixed the original matrix is returned unchanged.
+
+    Args:
+        qubo_matrix: The QUBO matrix, dense or scipy.sparse
+        constant: Constant term in the QUBO formulation
+
+    Returns:
+        PresolveResult describing the reduced problem
+    """
+    num_vars = qubo_matrix.shape[0]
+    original = qubo_matrix
+    sparse = sp.issparse(qubo_matrix)
+    if sparse:
+        qubo_matrix = qubo_matrix.tocsr().astype(float)
+        coupling = (qubo_matrix + qubo_matrix.T).tocsr()
+        coupling = (coupling - sp.diags(coupling.diagonal())).tocsr()
+        coupling.eliminate_zeros()
+        diagonal = qubo_matrix.diagonal()
+        ones = np.ones(num_vars)
+        negative = coupling.minimum(0).tocsr() @ ones
+        positive = coupling.maximum(0).tocsr() @ ones
+    else:
+        diagonal, negative, positive = _dense_bounds(qubo_matrix)
+
+    free_mask = np.ones(num_vars, dtype=bool)
+    fixed_values = np.zeros(num_vars, dtype=np.int64)
+    # Q_ii plus the couplings to variables fixed at 1
+    linear = diagonal.copy()
+    lower = linear + negative
+    upper = linear + positive
+
+    for _ in range(max_rounds):
+        fix_zero = free_mask & (lower >= 0)
+        fix_one = free_mask & (upper <= 0) & ~fix_zero
+        if not (fix_zero.any() or fix_one.any()):
+            break
+        free_mask &= ~(fix_zero | fix_one)
+        fixed_values[fix_one] = 1
+
+        # Fixed variables leave the free sums; those fixed at 1 join the linear terms
+        newly_fixed = np.nonzero(fix_zero | fix_one)[0]
+        if sparse:
+            rows = coupling[newly_fixed]
+            values = fixed_values[newly_fixed].astype(float)
+            lower -= rows.minimum(0).T @ np.ones(len(newly_fixed))
+            upper -= rows.maximum(0).T @ np.ones(len(newly_fixed))
+            shift = rows.T @ values
+            linear += shift
+            lower += shift
+            upper += shift
+        else:
+            block = max(1, BLOCK_BYTES // (8 * max(num_vars, 1)))
+            for start in range(0, len(newly_fixed), block):
+                indices = newly_fixed[start:start + block]
+                rows = _dense_coupling_rows(qubo_matrix, indices)
+                values = fixed_values[indices].astype(float)
+                shift = values @ rows
+                linear += shift
+                lower += shift - np.minimum(rows, 0).sum(axis=0)
+                upper += shift - np.maximum(rows, 0).sum(axis=0)
+
+    free = np.nonzero(free_mask)[0]
+    if len(free) == num_vars:
+        return PresolveResult(original, constant, free, fixed_values)
+    fixed_energy = float(fixed_values @ (qubo_matrix @ fixed_values))
+
+    if sparse:
+        reduced = qubo_matrix[free][:, free]
+        reduced = (reduced + sp.diags(linear[free] - diagonal[free])).tocsr()
+    else:
+        reduced = np.array(qubo_matrix[np.ix_(free, free)], dtype=float)
+        reduced[np.diag_indices(len(free))] = linear[free]
+
+    return PresolveResult(reduced, constant + fixed_energy, free, fixed_values)
@@ -0,0 +1,72 @@
+# Throttled progress reporting for solver hot loops
+import time
+
+
+class ProgressReporter:
+    """
+    Receives per-iteration costs from a solver and forwards a snapshot to a
+    callback at most once every `interval` seconds. The snapshot contains the
+    iteration count, best-so-far and current cost, elapsed time and iterations
+    per second.
+
+    The reporter also owns the convergence trace a solver returns. With
+    keep_trace=False nothing is accumulated and solvers return an empty list,
+    which is what streaming clients want.
+    """
+    def __init__(self, callback=None, interval=0.5, keep_trace=True):
+        self.callback = callback
+        self.interval = interval
+        self.keep_trace = keep_trace
+        self.costs = []
+        self.iterations = 0
+        self.current_cost = float('inf')
+        self.best_cost = float('inf')
+        self.start_time = time.perf_counter()
+        self._next_emit = self.start_time + interval
+
+    def record(self, cost, best_cost=None):
+        """
+        Records the cost of one solver iteration.
+        """
+        cost = float(cost)
+        if self.keep_trace:
+            self.costs.append(cost)
+        self.iterations += 1
+        self.current_cost = cost
+        self.update(cost if best_cost is None else best_cost)
+
+    def update(self, best_cost):
+        """
+        Reports a best-so-far cost without recording an iteration, for work
+        done between iterations.
+        """
+        if best_cost < self.best_cost:
+            self.best_cost = float(best_cost)
+        if self.callback is not None and time.perf_counter() >= self._next_emit:
+            self.emit()
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.start_time
+        return {
+            "iteration": self.iterations,
+            "best_cost": self.best_cost,
+            "current_cost": self.current_cost,
+            "elapsed": elapsed,
+            "iterations_per_second": self.iterations / elapsed if elapsed > 0 else 0.0
+        }
+
+    def emit(self):
+        """
+        Sends a snapshot to the callback immediately.
+        """
+        self.callback(self.snapshot())
+        self._next_emit = time.perf_counter() + self.interval
+
+    def forward(self, snapshot):
+        """
+        Takes over the iteration count and costs of a snapshot reported by a
+        solver running in another process.
+        """
+        self.iterations = snapshot["iteration"]
+        self.current_cost = snapshot["current_cost"]
+        self.update(snapshot["best_cost"])
@@ -1,37 +1,56 @@
 import numpy as np
-import copy
-import time
+import scipy.sparse as sp
 import pennylane as qml
+from .. import instrumentation
 
-def calculate_cost(angles, qnode, QUBO_matrix, const):
+def calculate_cost(angles, qnode, QUBO_matrix, const, evaluated=None):
     """
     Function to calculate a value for the cost function
+
+    If evaluated is a dictionary, the variable probabilities behind the cost
+    are stored in it under "probabilities" for reuse, e.g. by sampling.
     """
-    start_time1 = time.time()
-    nc = len(QUBO_matrix)
-    data = qnode(angles)
-    clist = data[::2] + data[1::2]
-    blist = []
-    for p in range(nc):
-        if clist[p] == 0:
-            blist.append(0.5)
-        else:
-            blist.append(data[2 * p + 1] / clist[p])
-
-    end_time1 = time.time()
-    print(f"Time running the qc and getting back results : " + str(end_time1 - start_time1))
-    
-    start_time_opt = time.time()
-    blist = copy.deepcopy(np.array(blist))
-    prob_matrix = np.outer(blist, blist)
-    prob_diag = np.diag(prob_matrix)
-    mat_diag = np.diag(QUBO_matrix)
-    totcost = np.multiply(prob_matrix, QUBO_matrix).sum()
-    subtract_cost = np.multiply(prob_diag, mat_diag).sum()
-    add_cost = np.multiply(blist, mat_diag).sum()
-    quantum_cost = totcost - subtract_cost + add_cost + const
-    
-    end_time_opt = time.time()
-    print(f"Time to estimate cost : " + str(end_time_opt - start_time_opt))
-    
-    return quantum_cost
\ No newline at end of file
+    nc = QUBO_matrix.shape[0]
+    with instrumentation.phase("circuit_execution"):
+        data = qnode(angles)
+    instrumentation.count("circuit_executions")
+
+    if evaluated is not None:
+        evaluated["probabilities"] = np.asarray(qml.math.unwrap(register_probabilities(data, nc)))
+
+    with instrumentation.phase("cost_estimation"):
+        return minenc_cost(data, nc, QUBO_matrix, const)
+
+def register_probabilities(data, nc):
+    """
+    Probability of each classical variable being 1 under the minimal
+    encoding: the ancilla-1 share of its register's probability, or 0.5 for
+    registers that are never observed.
+    """
+    register = data[0:2 * nc:2] + data[1:2 * nc:2]
+    observed = register > 0
+    safe_register = qml.math.where(observed, register, 1.0)
+    return qml.math.where(observed, data[1:2 * nc:2] / safe_register, 0.5)
+
+def minenc_cost(data, nc, QUBO_matrix, const):
+    """
+    Expected QUBO cost of the minimal-encoding register probabilities.
+
+    With b the variable probabilities, the cost is b^T Q b with the diagonal
+    terms counted as b_i instead of b_i^2, since x_i^2 = x_i. Only array
+    operations are used so autodiff interfaces can differentiate through it,
+    and sparse matrices are evaluated over their nonzeros without densifying.
+    """
+    blist = register_probabilities(data, nc)
+
+    if sp.issparse(QUBO_matrix):
+        coo = QUBO_matrix.tocoo()
+        quadratic = qml.math.sum(coo.data * blist[coo.row] * blist[coo.col])
+        mat_diag = QUBO_matrix.diagonal()
+    else:
+        quadratic = qml.math.dot(blist, qml.math.dot(QUBO_matrix, blist))
+        mat_diag = np.diagonal(QUBO_matrix)
+
+    quantum_cost = quadratic + qml.math.sum(mat_diag * (blist - blist ** 2)) + const
+
+    return quantum_cost
@@ -0,0 +1,77 @@
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import pennylane as qml
+from .circuit import pennylane_HEcirc
+
+class QNodeCache:
+    """
+    Keeps idle PennyLane devices and QNodes for reuse across solves, keyed by
+    (qubits, layers, shots, diff_method, batched) and evicted least recently
+    used.
+
+    Devices hold simulator state and are not safe to share between threads,
+    so a QNode is checked out for the duration of a solve and handed back
+    afterwards; concurrent solves of the same shape each get their own.
+    """
+    def __init__(self, max_size=8):
+        self.max_size = max_size
+        self._idle = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _build(self, num_qubits, num_layers, shots, diff_method, batched):
+        # Backpropagation needs a simulator implemented in an autodiff framework
+        device_name = "default.qubit" if diff_method == "backprop" else "lightning.qubit"
+        dev = qml.device(device_name, wires=num_qubits, shots=shots)
+        gradient_kwargs = {"broadcast": True} if batched else {}
+        return qml.QNode(
+            lambda angles: pennylane_HEcirc(angles, num_qubits), dev,
+            diff_method=diff_method, gradient_kwargs=gradient_kwargs
+        )
+
+    @contextmanager
+    def qnode(self, num_qubits, num_layers, shots, diff_method="parameter-shift", batched=False):
+        """
+        Yields a QNode evaluating the hardware efficient ansatz with the
+        given shape, building one only when no idle QNode matches.
+
+        Args:
+            shots: Number of samples per execution, or None for exact
+                probabilities
+            diff_method: PennyLane differentiation method
+            batched: Evaluate all parameter-shifted circuits of a gradient
+                as one broadcast execution (parameter-shift only)
+        """
+        key = (num_qubits, num_layers, shots, diff_method, batched)
+        with self._lock:
+            idle = self._idle.get(key)
+            qnode = idle.pop() if idle else None
+            if idle is not None and not idle:
+                del self._idle[key]
+            if qnode is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if qnode is None:
+            qnode = self._build(num_qubits, num_layers, shots, diff_method, batched)
+        try:
+            yield qnode
+        finally:
+            with self._lock:
+                self._idle.setdefault(key, []).append(qnode)
+                self._idle.move_to_end(key)
+                while sum(len(qnodes) for qnodes in self._idle.values()) > self.max_size:
+                    oldest_key, oldest = next(iter(self._idle.items()))
+                    oldest.pop(0)
+                    if not oldest:
+                        del self._idle[oldest_key]
+
+    def clear(self):
+        with self._lock:
+            self._idle.clear()
+
+QNODE_CACHE = QNodeCache(int(os.environ.get("QUBO_QNODE_CACHE_SIZE", 8)))
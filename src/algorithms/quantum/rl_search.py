@@ -1,6 +1,10 @@
+import bisect
+import logging
+from collections import deque
 import numpy as np
-import torch
 import time
+from .. import instrumentation
+from ..local_field import LocalField
 
 def softmax(x, temperature=1.0):
     e_x = np.exp((x - np.max(x)) / temperature)
@@ -9,15 +13,48 @@ def softmax(x, temperature=1.0):
 def calculate_percentile(input_values, q):
     return np.percentile(input_values, q)
 
+class SlidingPercentile:
+    """
+    Keeps the last window values in arrival order and in sorted order, so a
+    percentile is an O(1) lookup and an update costs one binary search and
+    one list shift instead of re-sorting the window.
+    """
+    def __init__(self, values=(), window=100):
+        self.window = window
+        self.recent = deque()
+        self.ordered = []
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        self.recent.append(value)
+        bisect.insort(self.ordered, value)
+        if len(self.recent) > self.window:
+            del self.ordered[bisect.bisect_left(self.ordered, self.recent.popleft())]
+
+    def percentile(self, q):
+        """
+        Same linear interpolation as np.percentile.
+        """
+        position = (len(self.ordered) - 1) * q / 100
+        lower = int(position)
+        upper = min(lower + 1, len(self.ordered) - 1)
+        return self.ordered[lower] + (self.ordered[upper] - self.ordered[lower]) * (position - lower)
+
 def rescaled_rank_rewards(current_value, previous_values, q=1):
-    Cq = calculate_percentile(previous_values, q)
-    print(f"Percentile cost: {Cq}")
+    """
+    previous_values is a SlidingPercentile or a sequence of recent costs.
+    """
+    if isinstance(previous_values, SlidingPercentile):
+        Cq = previous_values.percentile(q)
+    else:
+        Cq = calculate_percentile(previous_values, q)
     if current_value < Cq:
         return -(q / 100)
     elif current_value > Cq:
         return 1 - q / 100
     else:
-        return 1 if torch.rand(1).item() > 0.5 else -1
+        return 1 if np.random.rand() > 0.5 else -1
 
 def simulated_annealing(current_cost, new_cost, temperature):
     if new_cost < current_cost:
@@ -25,51 +62,68 @@ def simulated_annealing(current_cost, new_cost, temperature):
     else:
         return True
 
-def simplified_rl_search(bitstring, QUBO_matrix, const, time_limit, temperature=10, verbose=False):
+def simplified_rl_search(bitstring, QUBO_matrix, const, time_limit, temperature=10, verbose=False, batch_size=1,
+                         control=None):
     """
     Reinforcement learning local search for enhancing solution quality
+
+    Flip costs are read from an incremental local field (see LocalField), so
+    a move costs O(n) rather than a full x^T Q x evaluation, and dense or
+    sparse matrices can be searched directly.
+
+    With batch_size > 1, each step evaluates the batch_size bits with the
+    highest UCB scores, rewards all of them and flips the best one.
+
+    The search also ends early when control (a SolverControl) is interrupted.
     """
-    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-    QUBO_matrix = torch.tensor(QUBO_matrix, dtype=torch.float32, device=device)
-    const = torch.tensor(const, dtype=torch.float32, device=device)
-    initial_bitstring = torch.tensor(bitstring, dtype=torch.float32, device=device)
-    
-    best_state = initial_bitstring.clone()
-    state = initial_bitstring.clone()
-    num_bits = len(bitstring)
-    best_cost = torch.matmul(state, torch.matmul(QUBO_matrix, state)) + const
-    progress_costs = [best_cost.item()]
-    cut_values = [best_cost.item()]
+    state = LocalField(QUBO_matrix, bitstring, const)
+    num_bits = len(state.solution)
+    batch_size = min(batch_size, num_bits)
+
+    best_state = state.solution.copy()
+    best_cost = state.energy
+    progress_costs = [best_cost]
+    cut_values = SlidingPercentile([best_cost])
     bit_flip_counts = np.zeros(num_bits)
     bit_flip_total_rewards = np.zeros(num_bits)
-    
+    total_actions = 0
+
     start_time = time.time()
     while not time_limit or (time.time() - start_time) < time_limit:
-        total_actions = np.sum(bit_flip_counts)
+        if control is not None and control.interrupted():
+            break
         if total_actions > 0:
             ucb_scores = bit_flip_total_rewards / (bit_flip_counts + 1e-5)
             ucb_scores += np.sqrt(2 * np.log(total_actions) / (bit_flip_counts + 1e-5))
-            bit_to_flip = np.argmax(ucb_scores)
+            if batch_size > 1:
+                candidates = np.argpartition(ucb_scores, -batch_size)[-batch_size:]
+            else:
+                candidates = np.array([np.argmax(ucb_scores)])
         else:
-            bit_to_flip = np.random.choice(num_bits)
-            
-        new_state = state.clone()
-        new_state[bit_to_flip] = 1 - new_state[bit_to_flip]
-        new_cost = torch.matmul(new_state, torch.matmul(QUBO_matrix, new_state)) + const
-        progress_costs.append(new_cost.item())
-
-        if simulated_annealing(best_cost.item(), new_cost.item(), temperature):
-            if new_cost.item() < best_cost.item():
-                best_state = new_state
+            candidates = np.random.choice(num_bits, batch_size, replace=False)
+
+        deltas = state.diagonal[candidates] + (1 - 2 * state.solution[candidates]) * state.field[candidates]
+        new_costs = (state.energy + deltas).tolist()
+        choice = int(np.argmin(deltas))
+        bit_to_flip, new_cost = candidates[choice], new_costs[choice]
+        progress_costs.append(new_cost)
+
+        if simulated_annealing(best_cost, new_cost, temperature):
+            state.flip(bit_to_flip, deltas[choice])
+            if new_cost < best_cost:
+                best_state = state.solution.copy()
                 best_cost = new_cost
-            state = new_state
-            cut_values.append(new_cost.item())
-            cut_values = cut_values[-100:]
+            cut_values.add(new_cost)
 
-        bit_flip_total_rewards[bit_to_flip] += rescaled_rank_rewards(new_cost.item(), cut_values)
-        bit_flip_counts[bit_to_flip] += 1
+        for bit, cost in zip(candidates, new_costs):
+            bit_flip_total_rewards[bit] += rescaled_rank_rewards(cost, cut_values)
+            bit_flip_counts[bit] += 1
+        total_actions += len(candidates)
 
         if verbose:
-            print(f"Current cost: {new_cost.item()}, Best cost: {best_cost.item()}")
+            logging.debug(f"Current cost: {new_cost}, Best cost: {best_cost}")
+
+    instrumentation.count("energy_evaluations", total_actions, solver="quantum-inspired")
+    instrumentation.count("local_search_flips", len(progress_costs) - 1, solver="quantum-inspired")
 
-    return best_state.cpu().numpy(), best_cost.cpu().numpy(), progress_costs
\ No newline at end of file
+    return best_state, best_cost, progress_costs
@@ -1,25 +1,37 @@
 import numpy as np
-import numpy.random as cnp
+import pennylane as qml
+from .cost_function import register_probabilities
 
-def draw_bitstrings_minenc(angles, qnode, QUBO_matrix, nbitstrings):
+def draw_bitstrings_minenc(angles, qnode, QUBO_matrix, nbitstrings, probabilities=None, max_attempts=None):
     """
-    Function to sample nbitstrings unique bitstrings from the output of the QC
+    Function to sample up to nbitstrings unique bitstrings from the output of the QC
+
+    Whole blocks of bitstrings are drawn at once by comparing uniform samples
+    with the variable probabilities, and deduplicated on their packed bits.
+    Sampling stops after max_attempts draws (default: 100 * nbitstrings),
+    so fewer bitstrings are returned when the distribution is close to
+    deterministic.
+
+    Args:
+        probabilities: Variable probabilities already computed for angles,
+            see register_probabilities; the circuit is only run when omitted
     """
-    nc = len(QUBO_matrix)
-    data = qnode(angles)
-    clist = data[::2] + data[1::2]
-    blist = []
-    for p in range(nc):
-        if clist[p] == 0:
-            blist.append(0.5)
-        else:
-            blist.append(data[2 * p + 1] / clist[p])
+    nc = QUBO_matrix.shape[0]
+    if probabilities is None:
+        probabilities = register_probabilities(qml.math.unwrap(qnode(angles)), nc)
+    probabilities = np.asarray(probabilities, dtype=float)
+    if max_attempts is None:
+        max_attempts = 100 * nbitstrings
 
-    list_of_bitstrings = set()
-    rz1 = cnp.random.RandomState()
+    list_of_bitstrings = {}
+    attempts = 0
+    while len(list_of_bitstrings) < nbitstrings and attempts < max_attempts:
+        block_size = min(2 * (nbitstrings - len(list_of_bitstrings)), max_attempts - attempts)
+        block = np.random.random_sample((block_size, nc)) < probabilities
+        attempts += block_size
 
-    while len(list_of_bitstrings) < nbitstrings:
-        bitstring = tuple(rz1.choice(2, p=[1 - bitprob, bitprob]) for bitprob in blist)
-        list_of_bitstrings.add(bitstring)
+        packed, first = np.unique(np.packbits(block, axis=1), axis=0, return_index=True)
+        for key, index in zip(packed, first):
+            list_of_bitstrings.setdefault(key.tobytes(), block[index])
 
-    return [np.array(bitstring) for bitstring in list_of_bitstrings]
\ No newline at end of file
+    return [bitstring.astype(np.int64) for bitstring in list(list_of_bitstrings.values())[:nbitstrings]]
@@ -1,12 +1,19 @@
+import logging
 import numpy as np
+import scipy.sparse as sp
 import pennylane as qml
+from pennylane import numpy as pnp
 import time
-from .quantum.circuit import pennylane_HEcirc
+from . import instrumentation
+from .control import as_control
+from .quantum.qnode_cache import QNODE_CACHE
 from .quantum.cost_function import calculate_cost
 from .quantum.rl_search import simplified_rl_search
 from .quantum.sampling import draw_bitstrings_minenc
+from .local_field import as_solution
+from .progress import ProgressReporter
 
-def quantum_inspired(qubo_matrix, constant, parameters=None):
+def quantum_inspired(qubo_matrix, constant, parameters=None, progress=None, control=None):
     """
     Quantum-Inspired Optimization Algorithm for QUBO problems.
     
@@ -20,6 +27,20 @@ def quantum_inspired(qubo_matrix, constant, parameters=None):
             - opt_time: Optimizer time in seconds (default: 10)
             - rl_time: RL search time in seconds (default: 10)
             - initial_temperature: Starting temperature (default: 10)
+            - rl_batch_size: Candidate flips the RL search evaluates per
+              step (default: 1)
+            - shots: Circuit samples per execution; None uses the exact
+              simulator probabilities (default: 10000)
+            - diff_method: "parameter-shift" or "backprop"; backprop needs
+              exact probabilities (default: "backprop" when shots is None,
+              otherwise "parameter-shift")
+            - batched_shifts: Evaluate all parameter-shifted circuits of a
+              gradient in one broadcast execution (default: False)
+            - initial_solution: Solution refined by the RL search alongside
+              the first sampled bitstrings (default: None)
+        progress: Optional ProgressReporter receiving the best cost per iteration
+        control: Optional SolverControl checked after every iteration and
+            inside the optimizer and RL search time slices
     
     Returns:
         Tuple containing:
@@ -30,6 +51,9 @@ def quantum_inspired(qubo_matrix, constant, parameters=None):
     """
     if parameters is None:
         parameters = {}
+    if progress is None:
+        progress = ProgressReporter()
+    control = as_control(control)
     
     num_layers = parameters.get('num_layers', 2)
     max_iters = parameters.get('max_iters', 100)
@@ -37,64 +61,83 @@ def quantum_inspired(qubo_matrix, constant, parameters=None):
     opt_time = parameters.get('opt_time', 10)
     rl_time = parameters.get('rl_time', 10)
     initial_temperature = parameters.get('initial_temperature', 10)
+    rl_batch_size = parameters.get('rl_batch_size', 1)
+    num_shots = parameters.get('shots', 10000)
+    diff_method = parameters.get('diff_method', "backprop" if num_shots is None else "parameter-shift")
+    batched_shifts = parameters.get('batched_shifts', False)
+    initial_solution = parameters.get('initial_solution')
+
+    if diff_method not in ("parameter-shift", "backprop"):
+        raise ValueError(f"Unsupported diff_method: {diff_method}")
+    if diff_method == "backprop" and num_shots is not None:
+        raise ValueError("diff_method 'backprop' requires shots=None")
+
+    if sp.issparse(qubo_matrix):
+        qubo_matrix = qubo_matrix.tocsr()
     
-    nqq = int(np.ceil(np.log2(len(qubo_matrix)))) + 1
-    num_shots = 10000
-    dev = qml.device("lightning.qubit", wires=nqq, shots=num_shots)
-    qnode = qml.QNode(lambda angles: pennylane_HEcirc(angles, nqq), dev, diff_method="parameter-shift")
-    p1;
-    print(f"Number of classical variables = {len(qubo_matrix)}")
-    print(f"Number of qubits for the quantum circuit = {nqq}")
-    print(f"Number of layers for the quantum circuit = {num_layers}")
-    print(f"Number of shots = {num_shots}")
-    print(f"PRINNNNNN1")
+    nqq = int(np.ceil(np.log2(qubo_matrix.shape[0]))) + 1
+    logging.info(
+        f"Quantum-inspired solve: {qubo_matrix.shape[0]} variables, {nqq} qubits, "
+        f"{num_layers} layers, {num_shots if num_shots is not None else 'exact'} shots, {diff_method}"
+    )
     opt = qml.AdamOptimizer(stepsize=0.01)
-    print(f"PRINNNNNN2")
-    theta = np.array([2 * np.pi * np.random.rand() for _ in range(nqq * num_layers)], requires_grad=True)
-    print(f"PRINNNNNN3")
-    best_theta = []
+    theta = pnp.array([2 * np.pi * np.random.rand() for _ in range(nqq * num_layers)], requires_grad=True)
+    best_theta = theta
+    best_probabilities = None
+    evaluated = {}
     best_cost = float('inf')
     best_cost_opt = float('inf')
     best_bitstring = None
-    cost_values = []
     progress_opt_costs = []
-    print(f"PRINNNNNN4")
     start_time = time.time()
-    for iteration in range(max_iters):
-        # Run ADAM optimization
-        end_time = time.time() + opt_time
-        print(f"MPIKAAA")
-        while time.time() < end_time:
-            theta, opt_cost = opt.step_and_cost(
-                lambda angles: calculate_cost(angles, qnode, qubo_matrix, constant), 
-                theta
-            )
+    with QNODE_CACHE.qnode(nqq, num_layers, num_shots, diff_method, batched_shifts) as qnode:
+        for iteration in range(max_iters):
+            # Run ADAM optimization
+            end_time = time.time() + opt_time
+            while time.time() < end_time and not control.interrupted():
+                # The returned cost belongs to the angles before the step
+                previous_theta = theta
+                theta, opt_cost = opt.step_and_cost(
+                    lambda angles: calculate_cost(angles, qnode, qubo_matrix, constant, evaluated), 
+                    theta
+                )
             
-            if opt_cost < best_cost_opt:
-                best_cost_opt = opt_cost
-                best_theta = theta
-            progress_opt_costs.append(best_cost_opt)
+                if opt_cost < best_cost_opt:
+                    best_cost_opt = opt_cost
+                    best_theta = previous_theta
+                    best_probabilities = evaluated["probabilities"]
+                progress_opt_costs.append(best_cost_opt)
 
-        # Sample and improve bitstrings
-        drawn_bitstrings = draw_bitstrings_minenc(best_theta, qnode, qubo_matrix, nbitstrings)
+            # Sample and improve bitstrings
+            with instrumentation.phase("sampling"):
+                drawn_bitstrings = draw_bitstrings_minenc(
+                    best_theta, qnode, qubo_matrix, nbitstrings, probabilities=best_probabilities
+                )
+            if iteration == 0 and initial_solution is not None:
+                drawn_bitstrings.insert(0, as_solution(initial_solution))
         
-        for draw_bs in drawn_bitstrings:
-            best_bs_bb, current_cost, progress_rl_costs = simplified_rl_search(
-                draw_bs,
-                qubo_matrix,
-                constant,
-                rl_time / len(drawn_bitstrings),
-                temperature=initial_temperature,
-                verbose=True,
-            )
+            for draw_bs in drawn_bitstrings:
+                with instrumentation.phase("local_search"):
+                    best_bs_bb, current_cost, progress_rl_costs = simplified_rl_search(
+                        draw_bs,
+                        qubo_matrix,
+                        constant,
+                        rl_time / len(drawn_bitstrings),
+                        temperature=initial_temperature,
+                        batch_size=rl_batch_size,
+                        control=control,
+                    )
 
-            if current_cost < best_cost:
-                best_cost = current_cost
-                best_bitstring = best_bs_bb
+                if current_cost < best_cost:
+                    best_cost = current_cost
+                    best_bitstring = best_bs_bb
+                progress.update(best_cost)
 
-        cost_values.append(best_cost)
+            progress.record(best_cost)
+            if control.should_stop(best_cost):
+                break
 
     end_time = time.time()
     elapsed_time = end_time - start_time
 
-    return best_bitstring, best_cost, cost_values, elapsed_time
\ No newline at end of file
+    return best_bitstring, best_cost, progress.costs, elapsed_time
\ No newline at end of file
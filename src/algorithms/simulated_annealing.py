@@ -1,6 +1,10 @@
 # Simulated Annealing Algorithm Implementation
 import numpy as np
 import time
+from . import instrumentation
+from .control import as_control
+from .local_field import ReplicaLocalField, as_solution, initial_local_field
+from .progress import ProgressReporter
 
 def compute_cost(qubo_matrix, solution, constant):
     """
@@ -8,9 +12,117 @@ def compute_cost(qubo_matrix, solution, constant):
     """
     return solution @ qubo_matrix @ solution.T + constant
 
-def simulated_annealing(qubo_matrix, constant, parameters=None):
+def temperature_blocks(initial_temperature, cooling_rate, max_iterations, block_size=4096, min_temperature=1e-6):
+    """
+    Yields the geometric temperature schedule in blocks of at most block_size
+    steps, stopping after the first step whose cooled temperature falls below
+    min_temperature. Blocks keep pre-generated random numbers bounded in
+    memory for long schedules.
+    """
+    for start in range(0, max_iterations, block_size):
+        temperatures = initial_temperature * cooling_rate ** np.arange(start, min(start + block_size, max_iterations))
+        below = np.nonzero(temperatures * cooling_rate < min_temperature)[0]
+        if below.size:
+            yield temperatures[:below[0] + 1]
+            return
+        yield temperatures
+
+def anneal_replicas(qubo_matrix, constant, schedule, num_replicas, sweeps_per_temperature=0, progress=None,
+                    initial_solution=None, control=None):
+    """
+    Runs num_replicas independent annealing chains as one (R, n) array.
+    Every proposal, acceptance test and local-field update is applied to all
+    replicas at once.
+
+    Args:
+        schedule: Iterable of temperature arrays, see temperature_blocks
+        progress: ProgressReporter receiving the lowest current cost across
+            replicas per iteration
+        initial_solution: Optional starting solution of the first replica;
+            the others start from random solutions
+        control: Optional SolverControl checked after every temperature step
+
+    Returns:
+        Tuple containing:
+        - Best solution of each replica (numpy array, R x n)
+        - Best cost of each replica (numpy array, R)
+    """
+    num_vars = qubo_matrix.shape[0]
+    solutions = np.random.randint(0, 2, (num_replicas, num_vars))
+    if initial_solution is not None:
+        solutions[0] = as_solution(initial_solution)
+    state = ReplicaLocalField(qubo_matrix, solutions, constant)
+    if progress is None:
+        progress = ProgressReporter()
+    control = as_control(control)
+
+    best_solutions = state.solutions.copy()
+    best_costs = state.energies.copy()
+    best_cost = best_costs.min()
+
+    if sweeps_per_temperature > 0:
+        proposals_per_step = num_vars * sweeps_per_temperature
+        sweep_indices = np.broadcast_to(
+            np.tile(np.arange(num_vars), sweeps_per_temperature),
+            (num_replicas, proposals_per_step)
+        )
+    else:
+        proposals_per_step = 1
+
+    # Accept when delta < -T log(u), as in the single chain. Single-flip
+    # proposals and thresholds are drawn once per temperature block; sweeps
+    # already draw R x n x sweeps thresholds per temperature step
+    stopped = False
+    for temperatures in schedule:
+        if sweeps_per_temperature > 0:
+            proposals = (
+                (sweep_indices, -temperature * np.log(1.0 - np.random.rand(num_replicas, proposals_per_step)))
+                for temperature in temperatures
+            )
+        else:
+            block_indices = np.random.randint(num_vars, size=(len(temperatures), num_replicas, 1))
+            block_thresholds = -temperatures[:, None, None] * np.log(
+                1.0 - np.random.rand(len(temperatures), num_replicas, 1))
+            proposals = zip(block_indices, block_thresholds)
+
+        accepted_flips = 0
+        steps = 0
+        for flip_indices, thresholds in proposals:
+            for step in range(proposals_per_step):
+                indices = flip_indices[:, step]
+                cost_differences = state.deltas_at(indices)
+                accepted = cost_differences < thresholds[:, step]
+                if accepted.any():
+                    rows = state.rows[accepted]
+                    accepted_flips += rows.size
+                    state.flip(rows, indices[accepted], cost_differences[accepted])
+
+                    improved = rows[state.energies[rows] < best_costs[rows]]
+                    if improved.size:
+                        best_costs[improved] = state.energies[improved]
+                        best_solutions[improved] = state.solutions[improved]
+                        best_cost = min(best_cost, best_costs[improved].min())
+
+            progress.record(state.energies.min(), best_cost)
+            steps += 1
+            if control.should_stop(best_cost):
+                stopped = True
+                break
+
+        instrumentation.count("energy_evaluations", steps * proposals_per_step * num_replicas, solver="simulated-annealing")
+        instrumentation.count("accepted_flips", accepted_flips, solver="simulated-annealing")
+        if stopped:
+            break
+
+    return best_solutions, best_costs
+
+def simulated_annealing(qubo_matrix, constant, parameters=None, progress=None, control=None):
     """
     Implements Simulated Annealing for QUBO optimization.
+
+    Energy changes are read from an incremental local field, so a proposal
+    costs O(1) and an accepted flip O(n) instead of a full O(n^2) evaluation.
+    Random numbers are drawn in blocks rather than one per step.
     
     Args:
         qubo_matrix: The QUBO matrix
@@ -19,6 +131,16 @@ def simulated_annealing(qubo_matrix, constant, parameters=None):
             - initial_temperature: Starting temperature (default: 1000)
             - cooling_rate: Rate at which temperature decreases (default: 0.99)
             - max_iterations: Maximum number of iterations (default: 1000)
+            - sweeps_per_temperature: Full sweeps over all variables per
+              temperature step; 0 proposes a single random flip per step
+              (default: 0)
+            - num_replicas: Number of independent chains annealed together;
+              the best replica is returned (default: 1)
+            - initial_solution: Starting solution vector or LocalField
+              state; with replicas, the start of the first one
+              (default: random)
+        progress: Optional ProgressReporter receiving the cost per iteration
+        control: Optional SolverControl checked after every temperature step
     
     Returns:
         Tuple containing:
@@ -29,56 +151,90 @@ def simulated_annealing(qubo_matrix, constant, parameters=None):
     """
     if parameters is None:
         parameters = {}
+    if progress is None:
+        progress = ProgressReporter()
+    control = as_control(control)
     
     initial_temperature = parameters.get('initial_temperature', 1000)
     cooling_rate = parameters.get('cooling_rate', 0.99)
     max_iterations = parameters.get('max_iterations', 1000)
+    sweeps_per_temperature = parameters.get('sweeps_per_temperature', 0)
+    num_replicas = parameters.get('num_replicas', 1)
+    initial_solution = parameters.get('initial_solution')
     
     num_vars = qubo_matrix.shape[0]
+    schedule = temperature_blocks(initial_temperature, cooling_rate, max_iterations)
 
-    # Initialize random solution
-    current_solution = np.random.randint(0, 2, num_vars)
-    current_cost = compute_cost(qubo_matrix, current_solution, constant)
+    if num_replicas > 1:
+        start_time = time.time()
+        best_solutions, best_costs = anneal_replicas(
+            qubo_matrix, constant, schedule, num_replicas, sweeps_per_temperature, progress,
+            initial_solution, control
+        )
+        best_replica = int(np.argmin(best_costs))
+        elapsed_time = time.time() - start_time
+        return best_solutions[best_replica], float(best_costs[best_replica]), progress.costs, elapsed_time
 
-    best_solution = current_solution.copy()
-    best_cost = current_cost
+    state = initial_local_field(qubo_matrix, initial_solution, constant)
 
-    costs_per_iteration = []
-    temperature = initial_temperature
+    best_solution = state.solution.copy()
+    best_cost = state.energy
 
     start_time = time.time()
 
-    for iteration in range(max_iterations):
-        # Generate a neighbor by flipping a random bit
-        neighbor = current_solution.copy()
-        flip_index = np.random.randint(num_vars)
-        neighbor[flip_index] = 1 - neighbor[flip_index]  # Flip the bit
+    # Hot-loop references to the local-field state
+    solution = state.solution
+    field = state.field
+    diagonal = state.diagonal
 
-        # Compute cost of the neighbor
-        neighbor_cost = compute_cost(qubo_matrix, neighbor, constant)
+    if sweeps_per_temperature > 0:
+        proposals_per_step = num_vars * sweeps_per_temperature
+        sweep_order = np.tile(np.arange(num_vars), sweeps_per_temperature).tolist()
+    else:
+        proposals_per_step = 1
 
-        # Decide whether to accept the neighbor
-        cost_difference = neighbor_cost - current_cost
-        if cost_difference < 0 or np.random.rand() < np.exp(-cost_difference / temperature):
-            current_solution = neighbor
-            current_cost = neighbor_cost
+    # Accept when delta < -T log(u), equivalent to u < exp(-delta / T) with u in (0, 1]
+    stopped = False
+    for temperatures in schedule:
+        if sweeps_per_temperature > 0:
+            proposals = (
+                (sweep_order, (-temperature * np.log(1.0 - np.random.rand(proposals_per_step))).tolist())
+                for temperature in temperatures
+            )
+        else:
+            flip_indices = np.random.randint(num_vars, size=(len(temperatures), 1))
+            thresholds = -temperatures[:, None] * np.log(1.0 - np.random.rand(len(temperatures), 1))
+            proposals = zip(flip_indices.tolist(), thresholds.tolist())
 
-            # Update best solution if new solution is better
-            if current_cost < best_cost:
-                best_solution = current_solution.copy()
-                best_cost = current_cost
+        accepted_flips = 0
+        steps = 0
+        for indices, thresholds_at_step in proposals:
+            for flip_index, threshold in zip(indices, thresholds_at_step):
+                sign = 1 - 2 * solution[flip_index]
+                cost_difference = diagonal[flip_index] + sign * field[flip_index]
+                if cost_difference < threshold:
+                    state.flip(flip_index, cost_difference)
+                    accepted_flips += 1
 
-        # Record the current cost
-        costs_per_iteration.append(current_cost)
+                    # Update best solution if new solution is better
+                    if state.energy < best_cost:
+                        best_solution = solution.copy()
+                        best_cost = state.energy
 
-        # Cool down the temperature
-        temperature *= cooling_rate
+            # Record the current cost
+            progress.record(state.energy, best_cost)
+            steps += 1
+            if control.should_stop(best_cost):
+                stopped = True
+                break
 
-        # Stop if the temperature is too low
-        if temperature < 1e-6:
+        # Counted once per block to keep the inner loop free of bookkeeping
+        instrumentation.count("energy_evaluations", steps * proposals_per_step, solver="simulated-annealing")
+        instrumentation.count("accepted_flips", accepted_flips, solver="simulated-annealing")
+        if stopped:
             break
 
     end_time = time.time()
     elapsed_time = end_time - start_time
 
-    return best_solution, best_cost, costs_per_iteration, elapsed_time
\ No newline at end of file
+    return best_solution, best_cost, progress.costs, elapsed_time
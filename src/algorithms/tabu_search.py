@@ -1,5 +1,10 @@
 import numpy as np
 import time
+from typing import Optional
+from . import instrumentation
+from .control import SolverControl, as_control
+from .local_field import initial_local_field
+from .progress import ProgressReporter
 
 def compute_cost(qubo_matrix: np.ndarray, solution: np.ndarray, constant: float) -> float:
     """
@@ -12,58 +17,85 @@ def tabu_search(
     constant: float = 0.0,
     max_iterations: int = 1000, 
     tabu_tenure: int = 10, 
-    neighborhood_size: int = 10
+    neighborhood_size: Optional[int] = None,
+    aspiration: bool = True,
+    progress: Optional[ProgressReporter] = None,
+    initial_solution=None,
+    control: Optional[SolverControl] = None
 ) -> tuple:
     """
     Implements the Tabu Search algorithm for QUBO optimization.
+
+    Uses the one-flip neighborhood: every iteration evaluates the energy change
+    of flipping each variable from a maintained local field (O(n)) and moves to
+    the best non-tabu flip. Tabu status is attribute based: a flipped variable
+    may not be flipped again for tabu_tenure iterations, kept as a per-variable
+    expiry array. With aspiration, a tabu flip is still allowed when it yields
+    a new best solution.
+
+    If neighborhood_size is given and smaller than the number of variables,
+    only that many randomly chosen flips are considered per iteration.
+
+    The search starts from initial_solution (a solution vector or a
+    LocalField state) if given, otherwise from a random solution.
+
+    Costs per iteration are recorded through progress, if given, and the
+    search stops early when control says so.
     """
+    if progress is None:
+        progress = ProgressReporter()
+    control = as_control(control)
+
     start_time = time.time()
     num_vars = qubo_matrix.shape[0]
     
-    # Initialize random solution
-    current_solution = np.random.randint(0, 2, num_vars)
-    current_cost = compute_cost(qubo_matrix, current_solution, constant)
+    state = initial_local_field(qubo_matrix, initial_solution, constant)
     
-    best_solution = current_solution.copy()
-    best_cost = current_cost
+    best_solution = state.solution.copy()
+    best_cost = state.energy
     
-    tabu_list = []
-    cost_per_iteration = [current_cost]
+    tabu_expiry = np.zeros(num_vars, dtype=np.int64)
+    progress.record(state.energy, best_cost)
+    sample_neighborhood = neighborhood_size is not None and neighborhood_size < num_vars
+    moves = 0
+    completed_iterations = 0
     
     for iteration in range(max_iterations):
-        # Generate neighbors by flipping one bit at a time
-        neighbors = []
-        neighbor_costs = []
-        
-        for _ in range(neighborhood_size):
-            neighbor = current_solution.copy()
-            flip_index = np.random.randint(num_vars)
-            neighbor[flip_index] = 1 - neighbor[flip_index]  # Flip the bit
-            
-            if not any(np.array_equal(neighbor, x) for x in tabu_list):
-                neighbors.append(neighbor)
-                neighbor_costs.append(compute_cost(qubo_matrix, neighbor, constant))
-        
-        # Select the best neighbor that is not in the tabu list
-        if neighbors:
-            best_neighbor_index = np.argmin(neighbor_costs)
-            current_solution = neighbors[best_neighbor_index]
-            current_cost = neighbor_costs[best_neighbor_index]
-            
-            # Update tabu list
-            tabu_list.append(current_solution.copy())
-            if len(tabu_list) > tabu_tenure:
-                tabu_list.pop(0)
+        deltas = state.deltas()
+
+        if sample_neighborhood:
+            candidates = np.random.choice(num_vars, neighborhood_size, replace=False)
+        else:
+            candidates = np.arange(num_vars)
+
+        allowed = tabu_expiry[candidates] <= iteration
+        if aspiration:
+            allowed |= state.energy + deltas[candidates] < best_cost
+
+        # Move to the best admissible flip
+        if allowed.any():
+            candidates = candidates[allowed]
+            flip_index = candidates[np.argmin(deltas[candidates])]
+            state.flip(flip_index, deltas[flip_index])
+            tabu_expiry[flip_index] = iteration + 1 + tabu_tenure
+            moves += 1
             
             # Update best solution
-            if current_cost < best_cost:
-                best_solution = current_solution.copy()
-                best_cost = current_cost
+            if state.energy < best_cost:
+                best_solution = state.solution.copy()
+                best_cost = state.energy
         
         # Record the cost for this iteration
-        cost_per_iteration.append(current_cost)
+        progress.record(state.energy, best_cost)
+        completed_iterations += 1
+        if control.should_stop(best_cost):
+            break
     
+    evaluated = neighborhood_size if sample_neighborhood else num_vars
+    instrumentation.count("energy_evaluations", completed_iterations * evaluated, solver="tabu-search")
+    instrumentation.count("accepted_flips", moves, solver="tabu-search")
+
     end_time = time.time()
     elapsed_time = end_time - start_time
     
-    return best_solution, best_cost, cost_per_iteration, elapsed_time
\ No newline at end of file
+    return best_solution, best_cost, progress.costs, elapsed_time
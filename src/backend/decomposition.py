@@ -0,0 +1,199 @@
+import logging
+import os
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import breadth_first_order, connected_components
+from algorithms.control import as_control
+from algorithms.local_field import initial_local_field
+from algorithms.progress import ProgressReporter
+from backend.workers import process_context, reseed
+
+# Solvers that start worker processes of their own cannot run inside pool workers
+NESTED_SOLVERS = ("portfolio", "decomposition")
+
+
+def _solve_subproblem(qubo_matrix, constant, solver_type, parameters, control=None):
+    """
+    Worker entry point: solves one clamped subproblem with a registered solver.
+    """
+    from backend.solver import SOLVERS
+
+    solution, cost, _, _ = SOLVERS[solver_type](qubo_matrix, constant, dict(parameters), control=control)
+    return np.asarray(solution, dtype=np.int64), float(cost)
+
+
+def _partition_order(coupling, impact_order, subproblem_size):
+    """
+    Orders variables so that consecutive chunks are connected in the
+    coupling graph: components are visited by their highest-impact variable,
+    and components larger than a subproblem in breadth-first order from it.
+    """
+    num_vars = len(impact_order)
+    num_components, labels = connected_components(coupling, directed=False)
+    rank = np.empty(num_vars, dtype=np.int64)
+    rank[impact_order] = np.arange(num_vars)
+    seed_rank = np.full(num_components, num_vars)
+    np.minimum.at(seed_rank, labels, rank)
+    sizes = np.bincount(labels, minlength=num_components)
+    members = np.split(np.argsort(labels, kind="stable"), np.cumsum(sizes)[:-1])
+
+    order = []
+    for component in np.argsort(seed_rank):
+        if sizes[component] > subproblem_size:
+            seed = impact_order[seed_rank[component]]
+            order.append(breadth_first_order(coupling, seed, directed=False, return_predecessors=False))
+        else:
+            order.append(members[component])
+    return np.concatenate(order)
+
+
+def _subproblem(qubo_matrix, state, variables):
+    """
+    Builds the QUBO over variables with every other variable clamped to the
+    incumbent. Its energy at the incumbent's values equals the incumbent's.
+    """
+    clamped = state.solution.copy()
+    clamped[variables] = 0
+    if sp.issparse(qubo_matrix):
+        matrix = qubo_matrix[variables][:, variables].toarray()
+    else:
+        matrix = np.array(qubo_matrix[np.ix_(variables, variables)], dtype=float)
+    matrix[np.diag_indices(len(variables))] = state.diagonal[variables] + state.coupling[variables] @ clamped
+    current = state.solution[variables]
+    constant = state.energy - float(current @ matrix @ current)
+    return matrix, constant
+
+
+def _apply(state, variables, solution):
+    """
+    Moves the incumbent to solution on variables if that lowers its energy.
+    """
+    flips = variables[solution != state.solution[variables]]
+    if flips.size == 0:
+        return False
+    energy = state.energy
+    for index in flips:
+        state.flip(index)
+    if state.energy < energy - 1e-9:
+        return True
+    for index in flips:
+        state.flip(index)
+    return False
+
+
+def decomposition(qubo_matrix, constant, parameters=None, progress=None, control=None):
+    """
+    Decomposition meta-solver in the style of qbsolv for QUBOs too large for
+    a single search.
+
+    Each pass orders the variables, splits them into subproblems of
+    subproblem_size variables, clamps all other variables to the incumbent
+    and solves the subproblems with a registered solver. Subproblems of a
+    batch are solved in parallel worker processes from the same incumbent
+    and their solutions applied one by one, each only if it still lowers the
+    energy. Workers only receive the small dense subproblem matrices.
+
+    Args:
+        qubo_matrix: The QUBO matrix, dense or scipy.sparse (CSR preferred)
+        constant: Constant term in the QUBO formulation
+        parameters: Dictionary containing algorithm parameters
+            - subproblem_size: Variables per subproblem (default: 50)
+            - subsolver: Registered solver type for subproblems
+              (default: "tabu-search")
+            - subsolver_parameters: Parameters for the subsolver (default: {})
+            - selection: "impact" orders variables by the energy change of
+              flipping them, "partition" additionally groups variables
+              connected in the coupling graph (default: "impact")
+            - num_workers: Worker processes; 1 solves in-process
+              (default: number of CPUs)
+            - max_passes: Maximum passes over all variables (default: 10)
+            - stagnation_passes: Stop after this many passes without
+              improvement (default: 2)
+            - initial_solution: Starting incumbent, a solution vector or
+              LocalField state (default: random)
+        progress: Optional ProgressReporter receiving the incumbent cost per
+            batch of subproblems
+        control: Optional SolverControl checked after every batch; its
+            deadline also bounds the subproblem solves
+
+    Returns:
+        Tuple containing:
+        - Best solution found (numpy array)
+        - Best cost found (float)
+        - List of costs per batch (list of floats)
+        - Time taken (float)
+    """
+    if parameters is None:
+        parameters = {}
+    if progress is None:
+        progress = ProgressReporter()
+    control = as_control(control)
+    # Subproblem energies are full-problem energies, so the target applies as is
+    subproblem_control = control.for_worker()
+    subproblem_control.stagnation_limit = None
+
+    subproblem_size = parameters.get('subproblem_size', 50)
+    subsolver = parameters.get('subsolver', 'tabu-search')
+    subsolver_parameters = parameters.get('subsolver_parameters', {})
+    selection = parameters.get('selection', 'impact')
+    num_workers = parameters.get('num_workers', os.cpu_count() or 1)
+    max_passes = parameters.get('max_passes', 10)
+    stagnation_passes = parameters.get('stagnation_passes', 2)
+
+    if subsolver in NESTED_SOLVERS:
+        raise ValueError(f"{subsolver} cannot be used as a decomposition subsolver")
+    if selection not in ("impact", "partition"):
+        raise ValueError(f"Unknown subproblem selection: {selection}")
+
+    start_time = time.time()
+    if sp.issparse(qubo_matrix):
+        qubo_matrix = qubo_matrix.tocsr()
+    num_vars = qubo_matrix.shape[0]
+    state = initial_local_field(qubo_matrix, parameters.get('initial_solution'), constant)
+    progress.record(state.energy)
+
+    pool = process_context().Pool(num_workers, initializer=reseed) if num_workers > 1 else None
+    try:
+        passes_without_improvement = 0
+        for _ in range(max_passes):
+            pass_start_energy = state.energy
+            order = np.argsort(state.deltas(), kind="stable")
+            if selection == "partition":
+                order = _partition_order(state.coupling, order, subproblem_size)
+            chunks = [order[i:i + subproblem_size] for i in range(0, num_vars, subproblem_size)]
+
+            for batch_start in range(0, len(chunks), num_workers):
+                batch = chunks[batch_start:batch_start + num_workers]
+                tasks = [
+                    (*_subproblem(qubo_matrix, state, variables), subsolver, subsolver_parameters,
+                     subproblem_control)
+                    for variables in batch
+                ]
+                if pool is not None:
+                    results = pool.starmap(_solve_subproblem, tasks)
+                else:
+                    results = [_solve_subproblem(*task) for task in tasks]
+
+                for variables, (solution, _) in zip(batch, results):
+                    _apply(state, variables, solution)
+                progress.record(state.energy)
+                if control.should_stop(state.energy):
+                    break
+            if control.stop_reason is not None:
+                break
+
+            if state.energy < pass_start_energy - 1e-9:
+                passes_without_improvement = 0
+            else:
+                passes_without_improvement += 1
+                if passes_without_improvement >= stagnation_passes:
+                    break
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    logging.info(f"Decomposition finished with cost {state.energy}")
+    elapsed_time = time.time() - start_time
+    return state.solution.copy(), state.energy, progress.costs, elapsed_time
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import os
+import random
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+
+HTTP_TIMEOUT = float(os.environ.get("QUBO_HTTP_TIMEOUT", 10.0))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("QUBO_HTTP_CONNECT_TIMEOUT", 5.0))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("QUBO_HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("QUBO_HTTP_MAX_CONNECTIONS_PER_HOST", 10))
+HTTP_RETRIES = int(os.environ.get("QUBO_HTTP_RETRIES", 2))
+HTTP_BACKOFF = float(os.environ.get("QUBO_HTTP_BACKOFF", 0.5))
+
+# Responses worth retrying: rate limiting and transient gateway failures
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Longest wait before a retry, whatever Retry-After asks for
+MAX_RETRY_DELAY = 10.0
+
+# Methods that can be repeated even if the server may have seen the first attempt
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class HTTPClient:
+    """
+    Shared asynchronous HTTP client for outbound calls (GitHub, OAuth,
+    GPT4All). Connections are pooled and kept alive across requests, at
+    most max_connections_per_host of them per host, and every request has a
+    timeout.
+
+    Failed requests are retried up to `retries` times with exponential
+    backoff and jitter, honouring Retry-After. Idempotent methods are
+    retried on any transport error and on RETRY_STATUSES; other methods
+    only when the connection could not be established, since the server
+    cannot have seen them then.
+    """
+    def __init__(self, timeout: float = HTTP_TIMEOUT, connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+                 max_connections: int = HTTP_MAX_CONNECTIONS,
+                 max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+                 retries: int = HTTP_RETRIES, backoff: float = HTTP_BACKOFF,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_connections_per_host = max_connections_per_host
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport
+        )
+
+    def _slots(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_slots[host]
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), MAX_RETRY_DELAY)
+        return min(self.backoff * 2 ** attempt * (0.5 + random.random() / 2), MAX_RETRY_DELAY)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a request with retries and returns the last response. Raises
+        httpx.HTTPError (httpx.TimeoutException for timeouts) when the last
+        attempt fails without a response.
+        """
+        method = method.upper()
+        idempotent = method in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                async with self._slots(url):
+                    response = await self._client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                if last_attempt:
+                    raise
+                logging.warning(f"{method} {url} failed to connect ({e}), retrying")
+                await asyncio.sleep(self._delay(attempt))
+                continue
+            except httpx.TransportError as e:
+                if last_attempt or not idempotent:
+                    raise
+                logging.warning(f"{method} {url} failed ({e}), retrying")
+                await asyncio.sleep(self._delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and idempotent and not last_attempt:
+                logging.warning(f"{method} {url} returned {response.status_code}, retrying")
+                await asyncio.sleep(self._delay(attempt, response))
+                continue
+            return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+http_client: Optional[HTTPClient] = None
+
+
+def start_http_client(**options):
+    """Creates the application's shared client; call at startup."""
+    global http_client
+    http_client = HTTPClient(**options)
+
+
+async def stop_http_client():
+    """Closes the shared client and its connections; call at shutdown."""
+    global http_client
+    if http_client is not None:
+        await http_client.close()
+        http_client = None
+
+
+def get_http_client() -> HTTPClient:
+    """
+    Returns the shared client. Outside the application lifespan, for
+    example in scripts, one is created on first use.
+    """
+    if http_client is None:
+        start_http_client()
+    return http_client
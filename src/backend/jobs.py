@@ -0,0 +1,212 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, Optional
+from backend.workers import exit_on_sigterm, process_context, reseed
+
+JOB_STORE_PATH = os.environ.get("QUBO_JOB_STORE", "qubo_jobs.db")
+JOB_WORKERS = int(os.environ.get("QUBO_JOB_WORKERS", os.cpu_count() or 1))
+
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class JobStore:
+    """
+    SQLite-backed job table mirroring the columns of the Supabase "jobs" table.
+    A connection is opened per call so the store can be shared by the API
+    process, the scheduler thread and the worker processes.
+    """
+    def __init__(self, path: str = JOB_STORE_PATH):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    configuration TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, configuration: Dict[str, Any]) -> str:
+        """Stores a new pending job and returns its id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, configuration, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, "pending", json.dumps(configuration), now, now)
+            )
+        return job_id
+
+    def get(self, job_id: str, include_configuration: bool = False) -> Optional[Dict[str, Any]]:
+        """Returns the job as a dictionary, or None if it does not exist."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {
+            "job_id": row["id"],
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"]
+        }
+        if include_configuration:
+            job["configuration"] = json.loads(row["configuration"])
+        return job
+
+    def ids_with_status(self, status: str) -> list:
+        """Returns the ids of all jobs in a status, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (status,)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def transition(self, job_id: str, from_statuses: tuple, status: str,
+                   result: Any = None, error: Optional[str] = None) -> bool:
+        """
+        Moves a job to a new status if it is currently in one of from_statuses.
+        Returns False when the job was already moved on, e.g. cancelled.
+        """
+        placeholders = ", ".join("?" for _ in from_statuses)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? "
+                f"WHERE id = ? AND status IN ({placeholders})",
+                (status, json.dumps(result) if result is not None else None, error,
+                 time.time(), job_id, *from_statuses)
+            )
+        return cursor.rowcount == 1
+
+
+def run_job(store_path: str, job_id: str):
+    """
+    Worker process entry point: runs the stored solve request and writes the
+    result back to the store.
+    """
+    from algorithms.hardware.calibration import get_cost_model
+    from backend.solver import solve_request
+
+    exit_on_sigterm()
+    reseed()
+    store = JobStore(store_path)
+    job = store.get(job_id, include_configuration=True)
+    try:
+        result = solve_request(job["configuration"])
+    except Exception as e:
+        store.transition(job_id, ("running",), "failed", error=str(e))
+    else:
+        store.transition(job_id, ("running",), "completed", result=result)
+    finally:
+        # Worker processes end without running atexit handlers
+        get_cost_model().flush()
+
+
+class JobScheduler:
+    """
+    Runs stored jobs in at most max_workers worker processes. Each job gets its
+    own process so a running job can be cancelled by terminating it.
+    """
+    def __init__(self, store: JobStore, max_workers: int = JOB_WORKERS, poll_interval: float = 0.1):
+        self.store = store
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self._context = process_context()
+        self._pending = deque()
+        self._running = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        """Starts the dispatcher thread, recovering jobs left by a previous run."""
+        for job_id in self.store.ids_with_status("running"):
+            self.store.transition(job_id, ("running",), "failed", error="Interrupted by server restart")
+        self._pending.extend(self.store.ids_with_status("pending"))
+        self._thread = threading.Thread(target=self._dispatch, name="job-scheduler", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """Stops dispatching and terminates running workers."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        for job_id, process in list(self._running.items()):
+            process.terminate()
+            process.join()
+            self.store.transition(job_id, ACTIVE_STATUSES, "failed", error="Interrupted by server shutdown")
+        self._running.clear()
+
+    def submit(self, configuration: Dict[str, Any]) -> str:
+        """Stores a job and queues it for execution. Returns the job id."""
+        job_id = self.store.create(configuration)
+        with self._condition:
+            self._pending.append(job_id)
+            self._condition.notify()
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancels a pending or running job. Returns False if the job had already
+        finished.
+        """
+        with self._condition:
+            if job_id in self._pending:
+                self._pending.remove(job_id)
+            process = self._running.pop(job_id, None)
+            cancelled = self.store.transition(job_id, ACTIVE_STATUSES, "cancelled")
+        if process is not None:
+            process.terminate()
+            process.join()
+        return cancelled
+
+    def _dispatch(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                self._reap()
+                while self._pending and len(self._running) < self.max_workers:
+                    self._launch(self._pending.popleft())
+                self._condition.wait(self.poll_interval)
+
+    def _launch(self, job_id: str):
+        if not self.store.transition(job_id, ("pending",), "running"):
+            return
+        # Not a daemon, so solvers such as the portfolio can start their own workers
+        process = self._context.Process(target=run_job, args=(self.store.path, job_id))
+        process.start()
+        self._running[job_id] = process
+
+    def _reap(self):
+        for job_id, process in list(self._running.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            del self._running[job_id]
+            if process.exitcode != 0:
+                logging.error(f"Job {job_id} worker exited with code {process.exitcode}")
+                self.store.transition(
+                    job_id, ("running",), "failed",
+                    error=f"Worker exited with code {process.exitcode}"
+                )
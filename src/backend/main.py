@@ -1,11 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-import requests
 from fastapi.responses import RedirectResponse
+import os
 import urllib.parse
+from backend.http_client import get_http_client, start_http_client, stop_http_client
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_http_client()
+    start_scheduler()
+    yield
+    stop_scheduler()
+    await stop_http_client()
+
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS and Session
 app.add_middleware(
@@ -27,15 +37,21 @@ GITHUB_CLIENT_ID = "Ov23lik0nLhm747FIJLk"
 GITHUB_CLIENT_SECRET = "d329548607d310f4260a2a8c7b9d27eef763f77b"
 GITHUB_REDIRECT_URI = "http://localhost:8080/auth/callback"
 FRONTEND_URL = "http://localhost:8080"
+GITHUB_URL = os.environ.get("GITHUB_URL", "https://github.com")
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
 
 # Import and include all routes
 from backend.routes.github_routes import router as github_router
 from backend.routes.solver_routes import router as solver_router
 from backend.routes.gpt4all_routes import router as gpt4all_router
+from backend.routes.job_routes import router as job_router, start_scheduler, stop_scheduler
+from backend.routes.metrics_routes import router as metrics_router
 
 app.include_router(github_router, prefix="/api/github")
 app.include_router(solver_router, prefix="/api")
 app.include_router(gpt4all_router, prefix="/api/gpt4all")
+app.include_router(job_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
 
 @app.get("/api/auth/github")
 async def github_login():
@@ -45,15 +61,17 @@ async def github_login():
         'scope': 'read:user user:email repo',
         'response_type': 'code'
     }
-    url = f"https://github.com/login/oauth/authorize?{urllib.parse.urlencode(params)}"
+    url = f"{GITHUB_URL}/login/oauth/authorize?{urllib.parse.urlencode(params)}"
     return RedirectResponse(url=url)
 
 @app.get("/api/auth/github/callback")
 async def github_callback(request: Request, code: str):
     try:
+        client = get_http_client()
+
         # Exchange code for access token
-        token_response = requests.post(
-            "https://github.com/login/oauth/access_token",
+        token_response = await client.post(
+            f"{GITHUB_URL}/login/oauth/access_token",
             data={
                 "client_id": GITHUB_CLIENT_ID,
                 "client_secret": GITHUB_CLIENT_SECRET,
@@ -67,8 +85,8 @@ async def github_callback(request: Request, code: str):
             return {"error": "Failed to retrieve access token"}
 
         # Get user data including email
-        user_response = requests.get(
-            "https://api.github.com/user",
+        user_response = await client.get(
+            f"{GITHUB_API_URL}/user",
             headers={
                 "Authorization": f"Bearer {access_token}",
                 "Accept": "application/json",
@@ -77,8 +95,8 @@ async def github_callback(request: Request, code: str):
         user_data = user_response.json()
 
         # Get user's email
-        emails_response = requests.get(
-            "https://api.github.com/user/emails",
+        emails_response = await client.get(
+            f"{GITHUB_API_URL}/user/emails",
             headers={
                 "Authorization": f"Bearer {access_token}",
                 "Accept": "application/json",
@@ -0,0 +1,73 @@
+import base64
+from typing import Any
+import numpy as np
+import scipy.sparse as sp
+
+def parse_matrix(matrix_data) -> Any:
+    """
+    Builds a QUBO matrix from its JSON form: either a nested list (dense) or
+    COO triplets {"format": "coo", "shape": [n, n], "row": [...], "col": [...],
+    "data": [...]}, which yield a CSR matrix. Duplicate triplets are summed.
+    """
+    if isinstance(matrix_data, dict):
+        if matrix_data.get("format", "coo") != "coo":
+            raise ValueError(f"Unsupported matrix format: {matrix_data.get('format')}")
+        rows = np.asarray(matrix_data.get("row", []), dtype=np.int64)
+        cols = np.asarray(matrix_data.get("col", []), dtype=np.int64)
+        values = np.asarray(matrix_data.get("data", []), dtype=float)
+        shape = matrix_data.get("shape")
+        if shape is None:
+            size = int(max(rows.max(initial=-1), cols.max(initial=-1))) + 1
+            shape = (size, size)
+        return sp.coo_matrix((values, (rows, cols)), shape=tuple(shape)).tocsr()
+    return np.array(matrix_data)
+
+def matrix_to_json(matrix) -> Any:
+    """
+    Inverse of parse_matrix: sparse matrices are returned as COO triplets.
+    """
+    if sp.issparse(matrix):
+        coo = matrix.tocoo()
+        return {
+            "format": "coo",
+            "shape": list(coo.shape),
+            "row": coo.row.tolist(),
+            "col": coo.col.tolist(),
+            "data": coo.data.tolist()
+        }
+    return matrix.tolist()
+
+def solution_to_json(solution, solution_format: str = "list") -> Any:
+    """
+    Encodes a 0/1 solution for a JSON response: a list of ints, or with
+    solution_format "packed" the bits packed 8 per byte, least significant
+    bit first, as {"format": "packed", "num_vars": n, "data": <base64>}.
+    """
+    solution = np.asarray(solution, dtype=np.int64)
+    if solution_format == "list":
+        return solution.tolist()
+    if solution_format != "packed":
+        raise ValueError(f"Unsupported solution format: {solution_format}")
+    data = np.packbits(solution.astype(bool), bitorder="little").tobytes()
+    return {"format": "packed", "num_vars": len(solution), "data": base64.b64encode(data).decode("ascii")}
+
+def parse_solution(solution_data) -> np.ndarray:
+    """
+    Inverse of solution_to_json.
+    """
+    if isinstance(solution_data, dict):
+        if solution_data.get("format") != "packed":
+            raise ValueError(f"Unsupported solution format: {solution_data.get('format')}")
+        data = np.frombuffer(base64.b64decode(solution_data["data"]), dtype=np.uint8)
+        return np.unpackbits(data, count=solution_data["num_vars"], bitorder="little").astype(np.int64)
+    return np.asarray(solution_data, dtype=np.int64)
+
+def load_sparse_npz(path: str, default_constant: float = 0.0):
+    """
+    Loads a CSR matrix saved with scipy.sparse.save_npz. An optional
+    "constant" array stored in the same archive is used as the constant term.
+    """
+    matrix = sp.load_npz(path).tocsr()
+    with np.load(path) as archive:
+        constant = float(archive["constant"]) if "constant" in archive.files else default_constant
+    return matrix, constant
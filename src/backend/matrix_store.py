@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+import zipfile
+from typing import Any, Dict, Tuple
+import numpy as np
+import scipy.sparse as sp
+from backend.matrix_io import load_sparse_npz
+
+MATRIX_STORE_PATH = os.environ.get("QUBO_MATRIX_STORE", "matrix_store")
+# Unpickling an upload can run arbitrary code, so the legacy [matrix, constant]
+# object arrays are only accepted when the server operator opts in
+ALLOW_PICKLE_UPLOADS = os.environ.get("QUBO_ALLOW_PICKLE_UPLOADS", "").lower() in ("1", "true", "yes")
+CHUNK_SIZE = 1 << 20
+
+MATRIX_ID_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def _holds_objects(path: str) -> bool:
+    """
+    Returns whether a .npy file stores Python objects (and so pickled data),
+    reading only its header.
+    """
+    with open(path, "rb") as f:
+        try:
+            major, _ = np.lib.format.read_magic(f)
+        except ValueError:
+            return False
+        if major == 1:
+            _, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            _, _, dtype = np.lib.format.read_array_header_2_0(f)
+    return dtype.hasobject
+
+
+class MatrixStore:
+    """
+    Content-addressed store of uploaded QUBO matrices. Each matrix is kept as
+    <id>.npy (dense, memory-mapped on load) or <id>.npz (scipy.sparse CSR)
+    next to an <id>.json metadata file. The id is the SHA-256 of the uploaded
+    bytes followed by the constant term.
+    """
+    def __init__(self, root: str = MATRIX_STORE_PATH):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, matrix_id: str, extension: str) -> str:
+        if not MATRIX_ID_PATTERN.fullmatch(matrix_id):
+            raise ValueError(f"Invalid matrix id: {matrix_id}")
+        return os.path.join(self.root, f"{matrix_id}.{extension}")
+
+    async def save_upload(self, upload, constant: float = 0.0, allow_pickle: bool = False) -> Dict[str, Any]:
+        """
+        Streams an uploaded file to disk in chunks while hashing it, then
+        stores it under its content hash. Accepted formats:
+            - .npy holding a 2D numeric array
+            - .npz written by scipy.sparse.save_npz, optionally with a
+              "constant" array that overrides the constant argument
+            - with allow_pickle, the legacy .npy object array [matrix, constant].
+              Loading it unpickles the file, so only pass allow_pickle for
+              trusted uploads (see ALLOW_PICKLE_UPLOADS)
+
+        Returns:
+            Metadata of the stored matrix, including its matrix_id
+        """
+        hasher = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=self.root, suffix=".upload", delete=False) as temp_file:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                temp_file.write(chunk)
+        hasher.update(struct.pack("<d", constant))
+        matrix_id = hasher.hexdigest()
+
+        try:
+            if os.path.exists(self._path(matrix_id, "json")):
+                return self.metadata(matrix_id)
+            return self._store(temp_file.name, matrix_id, constant, allow_pickle)
+        finally:
+            if os.path.exists(temp_file.name):
+                os.unlink(temp_file.name)
+
+    def _store(self, upload_path: str, matrix_id: str, constant: float, allow_pickle: bool) -> Dict[str, Any]:
+        if zipfile.is_zipfile(upload_path):
+            matrix, stored_constant = load_sparse_npz(upload_path, default_constant=constant)
+            os.replace(upload_path, self._path(matrix_id, "npz"))
+            return self._write_metadata(matrix_id, matrix, stored_constant)
+
+        if not allow_pickle and _holds_objects(upload_path):
+            raise ValueError(
+                "Pickled [matrix, constant] uploads are disabled; upload a numeric .npy or a sparse .npz "
+                "and pass the constant separately"
+            )
+        data = np.load(upload_path, mmap_mode=None if allow_pickle else "r", allow_pickle=allow_pickle)
+        if data.dtype == object and data.shape == (2,):
+            matrix = np.asarray(data[0], dtype=float)
+            constant = float(data[1])
+            np.save(self._path(matrix_id, "npy"), matrix)
+        elif data.ndim == 2 and data.shape[0] == data.shape[1] and data.dtype.kind in "biuf":
+            matrix = data
+            os.replace(upload_path, self._path(matrix_id, "npy"))
+        else:
+            raise ValueError("Invalid file format: Expected a square numeric matrix or a sparse .npz")
+        return self._write_metadata(matrix_id, matrix, constant)
+
+    def _write_metadata(self, matrix_id: str, matrix, constant: float) -> Dict[str, Any]:
+        nnz = matrix.nnz if sp.issparse(matrix) else int(np.count_nonzero(matrix))
+        size = matrix.shape[0] * matrix.shape[1]
+        metadata = {
+            "matrix_id": matrix_id,
+            "format": "csr" if sp.issparse(matrix) else "dense",
+            "shape": list(matrix.shape),
+            "dtype": str(matrix.dtype),
+            "nnz": nnz,
+            "density": nnz / size if size else 0.0,
+            "constant": float(constant)
+        }
+        with open(self._path(matrix_id, "json"), "w") as f:
+            json.dump(metadata, f)
+        return metadata
+
+    def metadata(self, matrix_id: str) -> Dict[str, Any]:
+        """Returns the stored metadata, raising KeyError for unknown ids."""
+        path = self._path(matrix_id, "json")
+        if not os.path.exists(path):
+            raise KeyError(f"Unknown matrix id: {matrix_id}")
+        with open(path) as f:
+            return json.load(f)
+
+    def load(self, matrix_id: str) -> Tuple[Any, float]:
+        """
+        Returns (matrix, constant). Dense matrices are memory-mapped read-only.
+        """
+        metadata = self.metadata(matrix_id)
+        if metadata["format"] == "csr":
+            matrix, _ = load_sparse_npz(self._path(matrix_id, "npz"))
+        else:
+            matrix = np.load(self._path(matrix_id, "npy"), mmap_mode="r")
+        return matrix, metadata["constant"]
@@ -0,0 +1,152 @@
+import logging
+import queue
+import time
+from typing import Any, Dict
+import numpy as np
+from algorithms.control import as_control
+from algorithms.local_field import as_solution
+from algorithms.progress import ProgressReporter
+from backend.workers import SharedMatrix, process_context, reseed
+
+DEFAULT_MEMBERS = ["tabu-search", "simulated-annealing", "genetic-algorithm"]
+
+# Members stop at the deadline themselves; this is how long their results may take to arrive
+MEMBER_GRACE_PERIOD = 0.5
+
+
+def _run_member(descriptor: Dict[str, Any], constant: float, solver_type: str,
+                parameters: Dict[str, Any], results, control=None):
+    """
+    Worker process entry point: maps the shared matrix, runs one solver and
+    puts (solver_type, solution, cost, costs, time) on the results queue.
+    control carries the portfolio's deadline and target into the member.
+    """
+    from backend.solver import SOLVERS
+
+    reseed()
+    qubo_matrix, segments = SharedMatrix.attach(descriptor)
+    try:
+        solution, cost, costs, elapsed = SOLVERS[solver_type](qubo_matrix, constant, parameters, control=control)
+        results.put((solver_type, np.asarray(solution), float(cost), list(costs), elapsed, None))
+    except Exception as e:
+        results.put((solver_type, None, None, None, None, str(e)))
+
+
+def portfolio(qubo_matrix, constant, parameters=None, progress=None, control=None):
+    """
+    Runs several solvers concurrently in worker processes that share one copy
+    of the QUBO matrix, and returns the best result.
+
+    Args:
+        qubo_matrix: The QUBO matrix, dense or scipy.sparse
+        constant: Constant term in the QUBO formulation
+        parameters: Dictionary containing algorithm parameters
+            - solvers: Solver types to run, repeats allowed
+              (default: tabu-search, simulated-annealing, genetic-algorithm)
+            - solver_parameters: Parameters per solver type (default: {})
+            - time_limit: Wall-clock deadline in seconds; the best finished
+              result is returned once it passes (default: None)
+            - target_energy: Stop as soon as a solver reaches this cost
+              (default: None)
+            - initial_solution: Starting solution passed to every member
+              that has none of its own (default: None)
+        progress: Optional ProgressReporter receiving the best cost as
+            solvers finish
+        control: Optional SolverControl. Its deadline and target are
+            combined with time_limit and target_energy and passed to the
+            members, which stop early on their own; cancelling it
+            terminates the members
+
+    Returns:
+        Tuple containing:
+        - Best solution found (numpy array)
+        - Best cost found (float)
+        - List of costs per iteration of the winning solver (list of floats)
+        - Time taken (float)
+    """
+    if parameters is None:
+        parameters = {}
+    if progress is None:
+        progress = ProgressReporter()
+    control = as_control(control)
+
+    members = parameters.get('solvers', DEFAULT_MEMBERS)
+    member_parameters = parameters.get('solver_parameters', {})
+    time_limit = parameters.get('time_limit')
+    target_energy = parameters.get('target_energy')
+    initial_solution = parameters.get('initial_solution')
+
+    if 'portfolio' in members:
+        raise ValueError("A portfolio cannot contain itself")
+
+    start_time = time.time()
+    deadline = start_time + time_limit if time_limit is not None else None
+    if control.deadline is not None:
+        deadline = control.deadline if deadline is None else min(deadline, control.deadline)
+    if control.target_energy is not None:
+        target_energy = control.target_energy if target_energy is None else max(target_energy, control.target_energy)
+    member_control = control.for_worker()
+    member_control.deadline = deadline
+    member_control.target_energy = target_energy
+    collect_until = deadline + MEMBER_GRACE_PERIOD if deadline is not None else None
+    context = process_context()
+    results = context.Queue()
+    best = None
+    processes = []
+
+    with SharedMatrix(qubo_matrix) as shared:
+        try:
+            for solver_type in members:
+                solver_parameters = member_parameters.get(solver_type, {})
+                if initial_solution is not None and 'initial_solution' not in solver_parameters:
+                    solver_parameters = {**solver_parameters, 'initial_solution': as_solution(initial_solution)}
+                process = context.Process(
+                    target=_run_member,
+                    args=(shared.descriptor, constant, solver_type, solver_parameters, results, member_control)
+                )
+                process.start()
+                processes.append(process)
+
+            received = 0
+            while received < len(members):
+                if control.cancelled:
+                    control.stop_reason = "cancelled"
+                    break
+                # The deadline only applies once a result is available
+                waiting_on_deadline = deadline is not None and best is not None
+                if waiting_on_deadline and time.time() >= collect_until:
+                    control.stop_reason = "deadline"
+                    break
+                timeout = min(0.5, collect_until - time.time()) if waiting_on_deadline else 0.5
+                try:
+                    solver_type, solution, cost, costs, elapsed, error = results.get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes) and results.empty():
+                        break
+                    continue
+                received += 1
+
+                if error is not None:
+                    logging.warning(f"Portfolio member {solver_type} failed: {error}")
+                    continue
+                if best is None or cost < best[1]:
+                    best = (solution, cost, costs)
+                progress.update(cost)
+                if target_energy is not None and cost <= target_energy:
+                    control.stop_reason = "target"
+                    break
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+    if control.stop_reason is None and deadline is not None and time.time() >= deadline:
+        # Members stopped at the deadline themselves
+        control.stop_reason = "deadline"
+    if best is None:
+        raise RuntimeError("Solve cancelled" if control.cancelled else "All portfolio solvers failed")
+
+    best_solution, best_cost, best_costs = best
+    elapsed_time = time.time() - start_time
+    return best_solution, best_cost, best_costs if progress.keep_trace else [], elapsed_time
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import numpy as np
+import scipy.sparse as sp
+from algorithms import instrumentation
+
+RESULT_CACHE_PATH = os.environ.get("QUBO_RESULT_CACHE", "result_cache")
+RESULT_CACHE_MEMORY_ENTRIES = int(os.environ.get("QUBO_RESULT_CACHE_ENTRIES", 256))
+RESULT_CACHE_DISK_BYTES = int(os.environ.get("QUBO_RESULT_CACHE_BYTES", 256 << 20))
+
+
+def matrix_fingerprint(matrix) -> str:
+    """
+    BLAKE2b digest of the matrix shape and values. Sparse matrices are hashed
+    in canonical CSR form, so equal matrices hash equally however they were
+    built, but a dense and a sparse copy of the same matrix hash differently.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr(matrix.shape).encode())
+    if sp.issparse(matrix):
+        matrix = matrix.tocsr().astype(float)
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+        for array in (matrix.indptr, matrix.indices, matrix.data):
+            hasher.update(np.ascontiguousarray(array).tobytes())
+    else:
+        hasher.update(np.ascontiguousarray(matrix, dtype=float).tobytes())
+    return hasher.hexdigest()
+
+
+def problem_key(fingerprint: str, constant: float) -> str:
+    return hashlib.blake2b(f"{fingerprint}:{float(constant)!r}".encode(), digest_size=16).hexdigest()
+
+
+def result_key(fingerprint: str, constant: float, solver_type: str,
+               parameters: Dict[str, Any], seed: Optional[int]) -> str:
+    configuration = json.dumps(
+        {"solver_type": solver_type, "parameters": parameters, "seed": seed},
+        sort_keys=True, default=str
+    )
+    return hashlib.blake2b(
+        f"{problem_key(fingerprint, constant)}:{configuration}".encode(), digest_size=16
+    ).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of solve results: an in-memory LRU of memory_entries
+    results in front of a directory of JSON files bounded to disk_bytes,
+    evicted least recently used by modification time.
+
+    Besides exact results, the cache remembers the best solution found for
+    each problem (matrix and constant) by any solver, with the time it took.
+    """
+    def __init__(self, root: str = RESULT_CACHE_PATH, memory_entries: int = RESULT_CACHE_MEMORY_ENTRIES,
+                 disk_bytes: int = RESULT_CACHE_DISK_BYTES):
+        self.root = root
+        self.memory_entries = memory_entries
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0, "best-known": 0}
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json")
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _lookup(self, key: str):
+        """
+        Returns (entry, tier) or (None, None).
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry, "memory"
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+            os.utime(self._path(key))
+        except (OSError, ValueError):
+            return None, None
+        self._remember(key, entry)
+        return entry, "disk"
+
+    def _write(self, key: str, entry: Dict[str, Any]):
+        self._remember(key, entry)
+        temp_path = self._path(key) + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(temp_path, self._path(key))
+        self._evict_disk()
+
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.root, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.unlink(os.path.join(self.root, name))
+            except OSError:
+                pass
+            total -= size
+
+    def get(self, key: Optional[str], problem: str, time_budget: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached result for key with a "cache" field naming the tier
+        it came from; a key of None skips the exact lookup. Without an exact
+        entry, and if time_budget is given,
+        returns the best known solution of the problem when it was found
+        within time_budget seconds. Returns None on a miss.
+        """
+        entry, tier = self._lookup(key) if key is not None else (None, None)
+        if entry is None and time_budget is not None:
+            best, _ = self._lookup(f"best-{problem}")
+            if best is not None and best["time"] <= time_budget:
+                entry, tier = best, "best-known"
+
+        if entry is None:
+            self.misses += 1
+            instrumentation.count("result_cache_misses")
+            return None
+        self.hits[tier] += 1
+        instrumentation.count("result_cache_hits", tier=tier)
+        return {**entry, "cache": tier}
+
+    def put(self, key: str, problem: str, result: Dict[str, Any]):
+        """
+        Stores a result and updates the best known solution of the problem.
+        """
+        self._write(key, result)
+        best, _ = self._lookup(f"best-{problem}")
+        if best is None or result["cost"] < best["cost"] or (
+                result["cost"] == best["cost"] and result["time"] < best["time"]):
+            self._write(f"best-{problem}", result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": dict(self.hits), "misses": self.misses, "memory_entries": len(self._memory)}
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Returns the process-wide ResultCache, creating it on first use."""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+        return _result_cache
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Request
-import requests
 from typing import Optional
 import base64
+import os
 import urllib.parse
+from backend.http_client import get_http_client
 
 router = APIRouter()
 
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
 @router.get("/repos")
 async def get_repos(request: Request):
     token = request.session.get("github_token")
@@ -13,8 +16,8 @@ async def get_repos(request: Request):
         return {"error": "Not authenticated"}
     
     try:
-        response = requests.get(
-            "https://api.github.com/user/repos",
+        response = await get_http_client().get(
+            f"{GITHUB_API_URL}/user/repos",
             headers={
                 "Authorization": f"Bearer {token}",
                 "Accept": "application/vnd.github.v3+json",
@@ -37,8 +40,9 @@ def is_valid_base64(s: str) -> bool:
 async def get_repo_tree(owner: str, repo: str, token: str) -> dict:
     try:
         # First try to get the default branch
-        repo_response = requests.get(
-            f"https://api.github.com/repos/{owner}/{repo}",
+        client = get_http_client()
+        repo_response = await client.get(
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}",
             headers={
                 "Authorization": f"Bearer {token}",
                 "Accept": "application/vnd.github.v3+json",
@@ -51,8 +55,8 @@ async def get_repo_tree(owner: str, repo: str, token: str) -> dict:
         default_branch = repo_response.json().get('default_branch', 'main')
 
         # Then get the tree using the default branch
-        response = requests.get(
-            f"https://api.github.com/repos/{owner}/{repo}/git/trees/{default_branch}?recursive=1",
+        response = await client.get(
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/git/trees/{default_branch}?recursive=1",
             headers={
                 "Authorization": f"Bearer {token}",
                 "Accept": "application/vnd.github.v3+json",
@@ -83,8 +87,8 @@ async def get_file_contents(owner: str, repo: str, path: str, request: Request):
     
     try:
         encoded_path = urllib.parse.quote(path)
-        response = requests.get(
-            f"https://api.github.com/repos/{owner}/{repo}/contents/{encoded_path}",
+        response = await get_http_client().get(
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}/contents/{encoded_path}",
             headers={
                 "Authorization": f"Bearer {token}",
                 "Accept": "application/vnd.github.v3+json",
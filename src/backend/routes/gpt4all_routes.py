@@ -1,20 +1,22 @@
 from fastapi import APIRouter, HTTPException
-import requests
+import httpx
+import os
 from typing import Dict, Any
+from backend.http_client import get_http_client
 
 router = APIRouter()
 
-GPT4ALL_BASE_URL = "http://localhost:4891/v1"
+GPT4ALL_BASE_URL = os.environ.get("GPT4ALL_BASE_URL", "http://localhost:4891/v1")
 
 @router.get("/models")
 async def get_models():
     try:
-        response = requests.get(f"{GPT4ALL_BASE_URL}/models")
+        response = await get_http_client().get(f"{GPT4ALL_BASE_URL}/models")
         if response.status_code != 200:
             error_msg = response.json().get('error', 'Failed to fetch models from GPT4All')
             raise HTTPException(status_code=response.status_code, detail=error_msg)
         return response.json()
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to connect to GPT4All service: {str(e)}"
@@ -31,7 +33,7 @@ async def chat_completions(request_data: Dict[Any, Any]):
             "max_tokens": int(request_data.get("max_tokens", 1000))
         }
         
-        response = requests.post(
+        response = await get_http_client().post(
             f"{GPT4ALL_BASE_URL}/chat/completions",
             json=formatted_request,
             headers={"Content-Type": "application/json"},
@@ -43,12 +45,12 @@ async def chat_completions(request_data: Dict[Any, Any]):
             raise HTTPException(status_code=response.status_code, detail=error_msg)
             
         return response.json()
-    except requests.Timeout:
+    except httpx.TimeoutException:
         raise HTTPException(
             status_code=504,
             detail="Request to GPT4All timed out"
         )
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to connect to GPT4All service: {str(e)}"
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException
+from typing import Dict, Any, Optional
+from backend.jobs import JobStore, JobScheduler
+
+router = APIRouter()
+
+scheduler: Optional[JobScheduler] = None
+
+def start_scheduler():
+    global scheduler
+    scheduler = JobScheduler(JobStore())
+    scheduler.start()
+
+def stop_scheduler():
+    global scheduler
+    if scheduler is not None:
+        scheduler.shutdown()
+        scheduler = None
+
+def get_scheduler() -> JobScheduler:
+    if scheduler is None:
+        raise HTTPException(status_code=503, detail="Job scheduler is not running")
+    return scheduler
+
+@router.post("/jobs")
+async def create_job(data: Dict[Any, Any]):
+    job_id = get_scheduler().submit(data)
+    return {"job_id": job_id, "status": "pending"}
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = get_scheduler().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    jobs = get_scheduler()
+    if jobs.store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    jobs.cancel(job_id)
+    return jobs.store.get(job_id)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from algorithms.instrumentation import prometheus_text
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Solver metrics of the API process in the Prometheus text format. Solves
+    run as jobs report theirs in the per-job profile instead.
+    """
+    return PlainTextResponse(prometheus_text(), media_type="text/plain; version=0.0.4")
@@ -1,67 +1,95 @@
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from typing import Dict, Any
-import numpy as np
-import tempfile
-import os
-from backend.solver import solve_qubo
+import asyncio
+import json
+from backend.matrix_io import matrix_to_json
+from backend.matrix_store import ALLOW_PICKLE_UPLOADS, MatrixStore
+from backend.solver import control_from_payload, solve_request
+from algorithms.progress import ProgressReporter
 
 router = APIRouter()
 
 @router.post("/load-matrix")
-async def load_matrix(file: UploadFile = File(...)):
+async def load_matrix(file: UploadFile = File(...), include_matrix: bool = False):
+    # Returns the matrix_id and metadata, like /matrices; include_matrix=true
+    # adds the matrix as nested JSON for clients that still need a copy
     try:
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file.flush()
-            data = np.load(temp_file.name, allow_pickle=True)
-        os.unlink(temp_file.name)
-
-        if isinstance(data, np.ndarray) and data.shape == (2,):
-            matrix = data[0]
-            constant = float(data[1])
-        else:
-            raise ValueError("Invalid file format: Expected array with shape (2,)")
-
+        # Legacy pickled [matrix, constant] uploads only with the server-side opt-in
+        metadata = await MatrixStore().save_upload(file, allow_pickle=ALLOW_PICKLE_UPLOADS)
+        if not include_matrix:
+            return metadata
+        matrix, constant = MatrixStore().load(metadata["matrix_id"])
         return {
-            "matrix": matrix.tolist(),
+            **metadata,
+            "matrix": matrix_to_json(matrix),
             "constant": constant
         }
     except Exception as e:
         return {"error": str(e)}
 
+@router.post("/matrices")
+async def upload_matrix(file: UploadFile = File(...), constant: float = Form(0.0)):
+    try:
+        return await MatrixStore().save_upload(file, constant)
+    except Exception as e:
+        return {"error": str(e)}
+
+@router.get("/matrices/{matrix_id}")
+async def get_matrix(matrix_id: str):
+    try:
+        return MatrixStore().metadata(matrix_id)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 @router.post("/solve")
 async def solve(data: Dict[Any, Any]):
     try:
-        # Extract solver configuration
-        solver = data.get("solver", {})
-        dataset = data.get("dataset", {})
-        hardware = data.get("hardware", {})
+        return solve_request(data)
+    except Exception as e:
+        return {"error": str(e)}
 
-        # Configure solver parameters based on hardware
-        solver_parameters = {
-            **solver.get("solver_parameters", {}),
-            "hardware_type": hardware.get("provider_type"),
-            "hardware_specs": hardware.get("specs", {})
-        }
+@router.post("/solve/stream")
+async def solve_stream(data: Dict[Any, Any]):
+    """
+    Runs a solve and streams Server-Sent Events: "progress" events with the
+    iteration count, best-so-far cost and throughput every progress_interval
+    seconds (default 0.5), then a single "result" or "error" event. The
+    result omits the per-iteration trace, which was already streamed.
+    The solve is cancelled if the client disconnects before the result.
+    """
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
 
-        # Load dataset
-        matrix = np.array(dataset.get("matrix", []))
-        constant = float(dataset.get("constant", 0.0))
+    def publish(event: str, payload: Dict[str, Any]):
+        loop.call_soon_threadsafe(events.put_nowait, (event, payload))
 
-        # Run optimization
-        best_solution, best_cost, iterations_cost, time_taken = solve_qubo(
-            qubo_matrix=matrix,
-            solver_type=solver.get("solver_type", "tabu-search"),
-            parameters=solver_parameters,
-            constant=constant
-        )
+    progress = ProgressReporter(
+        callback=lambda snapshot: publish("progress", snapshot),
+        interval=float(data.get("progress_interval", 0.5)),
+        keep_trace=False
+    )
+    control = control_from_payload(data)
+
+    async def run():
+        try:
+            result = await run_in_threadpool(solve_request, data, progress, control)
+            publish("result", result)
+        except Exception as e:
+            publish("error", {"error": str(e)})
+
+    async def event_stream():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event, payload = await events.get()
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+                if event != "progress":
+                    break
+            await task
+        finally:
+            control.cancel()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
-        return {
-            "solution": best_solution.tolist(),
-            "cost": float(best_cost),
-            "iterations_cost": [float(c) for c in iterations_cost],
-            "time": time_taken
-        }
-    except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
@@ -1,27 +1,87 @@
+import logging
+import time
 import numpy as np
-from typing import Tuple, List, Dict, Any
+import scipy.sparse as sp
+from typing import Tuple, List, Dict, Any, Union
+from algorithms import instrumentation
+from algorithms.compact import CompactQUBO
+from algorithms.control import SolverControl
+from algorithms.local_field import LocalField
+from algorithms.presolve import presolve
 from algorithms.tabu_search import tabu_search
 from algorithms.simulated_annealing import simulated_annealing
 from algorithms.quantum_inspired import quantum_inspired
 from algorithms.genetic_algorithm import genetic_algorithm
 from algorithms.hardware.executor import HardwareExecutor
+from algorithms.progress import ProgressReporter
+from backend.matrix_io import parse_matrix, parse_solution, solution_to_json
+from backend.matrix_store import MatrixStore
+from backend.portfolio import portfolio
+from backend.decomposition import decomposition
+from backend.result_cache import get_result_cache, matrix_fingerprint, problem_key, result_key
+from backend.workers import SharedMatrix, process_context
+
+def run_tabu_search(m, c, p, progress=None, control=None):
+    # Module-level rather than a lambda so isolated hardware workers can unpickle it
+    return tabu_search(
+        qubo_matrix=m,
+        constant=c,
+        max_iterations=p.get('max-iterations', 1000),
+        tabu_tenure=p.get('tabu-tenure', 10),
+        neighborhood_size=p.get('neighborhood-size'),
+        aspiration=p.get('aspiration', True),
+        progress=progress,
+        initial_solution=p.get('initial_solution'),
+        control=control
+    )
+
+SOLVERS = {
+    "tabu-search": run_tabu_search,
+    "simulated-annealing": simulated_annealing,
+    "quantum-inspired": quantum_inspired,
+    "genetic-algorithm": genetic_algorithm,
+    "portfolio": portfolio,
+    "decomposition": decomposition
+}
+
+# Solvers whose kernels read the matrix only through LocalField states, which accept a CompactQUBO
+COMPACT_SOLVERS = ("tabu-search", "simulated-annealing")
 
 def solve_qubo(
-    qubo_matrix: np.ndarray,
+    qubo_matrix: Union[np.ndarray, sp.spmatrix],
     solver_type: str = "tabu-search",
     parameters: dict = None,
     constant: float = 0.0,
-    hardware_config: Dict[str, Any] = None
+    hardware_config: Dict[str, Any] = None,
+    progress: ProgressReporter = None,
+    control: SolverControl = None
 ) -> Tuple[np.ndarray, float, List[float], float]:
     """
     Solve QUBO problem using the specified solver and hardware.
     
+    Unless parameters["presolve"] is False, variables whose optimal value is
+    implied by persistency are fixed first (see algorithms.presolve) and
+    the solver only sees the remaining ones.
+
+    parameters["initial_solution"] warm-starts the solver and
+    parameters["initial_population"] seeds the genetic algorithm; both are
+    restricted to the free variables after presolve. An initial LocalField
+    state describes the full problem, so presolve is skipped for it.
+
+    With parameters["compact"], solvers in COMPACT_SOLVERS running on CPU
+    receive the matrix as a CompactQUBO (upper triangle in the smallest
+    lossless dtype, see algorithms.compact). This trades slower flips for
+    less memory, so it is off by default.
+
     Args:
-        qubo_matrix: The QUBO matrix
+        qubo_matrix: The QUBO matrix, dense or scipy.sparse (CSR preferred)
         solver_type: Type of solver to use
         parameters: Additional parameters for the solver
         constant: Constant term in the QUBO formulation
         hardware_config: Hardware configuration for execution
+        progress: Optional ProgressReporter receiving per-iteration costs
+        control: Optional SolverControl with the deadline, target energy,
+            stagnation limit and cancellation of the solve
     
     Returns:
         Tuple containing:
@@ -36,32 +96,181 @@ def solve_qubo(
     if hardware_config is None:
         hardware_config = {
             "provider_type": "CPU",
-            "specs": {"cores": 1, "memory": "4GB"},
+            "specs": {"cores": 1, "memory": "4GB", "isolated": False},
             "cost_per_hour": 0.0
         }
     
-    solvers = {
-        "tabu-search": lambda m, c, p: tabu_search(
-            qubo_matrix=m,
-            constant=c,
-            max_iterations=p.get('max-iterations', 1000),
-            tabu_tenure=p.get('tabu-tenure', 10),
-            neighborhood_size=p.get('neighborhood-size', 10)
-        ),
-        "simulated-annealing": simulated_annealing,
-        "quantum-inspired": quantum_inspired,
-        "genetic-algorithm": genetic_algorithm
-    }
-    
-    if solver_type not in solvers:
+    if solver_type not in SOLVERS:
         raise ValueError(f"Unknown solver type: {solver_type}")
     
-    solver_func = solvers[solver_type]
+    solver_func = SOLVERS[solver_type]
     
     # Initialize hardware executor
-    executor = HardwareExecutor(hardware_config)
+    executor = HardwareExecutor(hardware_config, process_context=process_context(), shared_matrix=SharedMatrix)
     
+    instrumentation.count("solves", solver=solver_type)
+    start_time = time.time()
+    reduction = None
+    initial_solution = parameters.get("initial_solution")
+    if parameters.get("presolve", True) and not isinstance(initial_solution, LocalField):
+        with instrumentation.phase("presolve"):
+            reduction = presolve(qubo_matrix, constant)
+        instrumentation.count("presolve_fixed_variables", reduction.num_fixed)
+        if reduction.num_fixed:
+            logging.info(f"Presolve fixed {reduction.num_fixed} of {qubo_matrix.shape[0]} variables")
+        if len(reduction.free) == 0:
+            solution = reduction.expand([])
+            return solution, reduction.constant, [reduction.constant], time.time() - start_time
+    if reduction is not None and reduction.num_fixed == 0:
+        # Nothing fixed: solve the original matrix without remapping
+        reduction = None
+    if reduction is not None:
+        qubo_matrix, constant = reduction.matrix, reduction.constant
+        parameters = dict(parameters)
+        if initial_solution is not None:
+            parameters["initial_solution"] = np.asarray(initial_solution)[reduction.free]
+        if parameters.get("initial_population") is not None:
+            parameters["initial_population"] = np.asarray(parameters["initial_population"])[:, reduction.free]
+
+    if (parameters.get("compact", False) and solver_type in COMPACT_SOLVERS
+            and executor.provider_type == "CPU" and not isinstance(initial_solution, LocalField)):
+        with instrumentation.phase("compact"):
+            qubo_matrix = CompactQUBO.from_matrix(qubo_matrix)
+
     try:
-        return executor.execute(solver_func, qubo_matrix, parameters, constant)
+        with instrumentation.phase("solve", solver=solver_type):
+            best_solution, best_cost, costs, elapsed_time = executor.execute(
+                solver_func, qubo_matrix, parameters, constant, progress, control, solver_type
+            )
     except Exception as e:
-        raise RuntimeError(f"Solver failed: {str(e)}")
\ No newline at end of file
+        raise RuntimeError(f"Solver failed: {str(e)}")
+
+    if reduction is not None:
+        best_solution = reduction.expand(best_solution)
+    return best_solution, best_cost, costs, elapsed_time
+
+def control_from_payload(data: Dict[str, Any]) -> SolverControl:
+    """
+    Builds the SolverControl described by the optional "control" section of
+    an /api/solve payload: "time_limit" (seconds), "target_energy" and
+    "stagnation_limit" (iterations without improvement).
+    """
+    options = data.get("control", {})
+    return SolverControl(
+        time_limit=options.get("time_limit"),
+        target_energy=options.get("target_energy"),
+        stagnation_limit=options.get("stagnation_limit")
+    )
+
+def solve_request(data: Dict[str, Any], progress: ProgressReporter = None,
+                  control: SolverControl = None) -> Dict[str, Any]:
+    """
+    Runs a solve described by an /api/solve payload and returns the JSON
+    response body.
+
+    Results are cached by matrix, constant, solver type, parameters and
+    seed (see backend.result_cache). Only seeded solves whose per-iteration
+    costs were kept are stored, since an unseeded solve is not a function of
+    its key and a result without its trace cannot answer a request that
+    wants one. An optional "cache" section controls this: "enabled"
+    (default true), "unseeded" (default false) to also cache unseeded
+    solves, and "time_budget", which accepts the best known solution of the
+    same problem if it was found within that many seconds.
+
+    The top-level "solution_format" selects how the solution is returned:
+    "list" (default) or "packed" bits, see matrix_io.solution_to_json.
+
+    Args:
+        data: Payload with "solver", "dataset" and "hardware" sections. The
+            dataset holds either an inline "matrix" or the "matrix_id" of a
+            stored matrix, whose constant can be overridden by "constant".
+            The solver section may hold a "seed" for NumPy's generator, and
+            its solver_parameters an "initial_solution", as a list or packed
+            (and for the genetic algorithm an "initial_population"), to
+            warm-start from. The hardware section is the hardware_config
+            of solve_qubo; CPU specs run the solve in an isolated worker
+            unless they set "isolated": false
+        progress: Optional ProgressReporter receiving per-iteration costs
+        control: Optional SolverControl, by default built from the payload
+            with control_from_payload; cancelling it stops the solve
+
+    Returns:
+        Dictionary with the solution, cost, per-iteration costs, time, the
+        instrumentation profile of the solve, why the solver stopped early
+        (or null) and, for cached results, the cache tier that served it
+    """
+    # Extract solver configuration
+    solver = data.get("solver", {})
+    dataset = data.get("dataset", {})
+    hardware = data.get("hardware", {})
+
+    # Configure solver parameters based on hardware
+    solver_parameters = {
+        **solver.get("solver_parameters", {}),
+        "hardware_type": hardware.get("provider_type"),
+        "hardware_specs": hardware.get("specs", {})
+    }
+
+    solver_type = solver.get("solver_type", "tabu-search")
+    seed = solver.get("seed")
+    cache_options = data.get("cache", {})
+    solution_format = data.get("solution_format", "list")
+    if control is None:
+        control = control_from_payload(data)
+
+    # Load dataset
+    if "matrix_id" in dataset:
+        matrix, constant = MatrixStore().load(dataset["matrix_id"])
+        constant = float(dataset.get("constant", constant))
+        fingerprint = f"matrix-{dataset['matrix_id']}"
+    else:
+        matrix = parse_matrix(dataset.get("matrix", []))
+        constant = float(dataset.get("constant", 0.0))
+        fingerprint = None
+
+    cache = get_result_cache() if cache_options.get("enabled", True) else None
+    reproducible = seed is not None or cache_options.get("unseeded", False)
+    if cache is not None:
+        if fingerprint is None:
+            fingerprint = matrix_fingerprint(matrix)
+        problem = problem_key(fingerprint, constant)
+        key = result_key(
+            fingerprint, constant, solver_type,
+            {"parameters": solver_parameters, "control": data.get("control", {})}, seed
+        )
+        cached = cache.get(key if reproducible else None, problem, cache_options.get("time_budget"))
+        if cached is not None:
+            if progress is not None:
+                progress.update(cached["cost"])
+            return {**cached, "solution": solution_to_json(cached["solution"], solution_format)}
+
+    if seed is not None:
+        np.random.seed(seed)
+    if isinstance(solver_parameters.get("initial_solution"), dict):
+        solver_parameters = {**solver_parameters,
+                             "initial_solution": parse_solution(solver_parameters["initial_solution"])}
+
+    # Run optimization
+    with instrumentation.profile() as metrics:
+        best_solution, best_cost, iterations_cost, time_taken = solve_qubo(
+            qubo_matrix=matrix,
+            solver_type=solver_type,
+            parameters=solver_parameters,
+            constant=constant,
+            hardware_config=hardware or None,
+            progress=progress,
+            control=control
+        )
+
+    result = {
+        "solution": solution_to_json(best_solution),
+        "cost": float(best_cost),
+        "iterations_cost": np.asarray(iterations_cost, dtype=float).tolist(),
+        "time": time_taken,
+        "profile": metrics.report(),
+        "stop_reason": control.stop_reason
+    }
+    keep_trace = progress is None or progress.keep_trace
+    if cache is not None and reproducible and keep_trace and not control.cancelled:
+        cache.put(key, problem, result)
+    return {**result, "solution": solution_to_json(result["solution"], solution_format)}
@@ -0,0 +1,115 @@
+import mmap
+import multiprocessing
+import signal
+import sys
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import scipy.sparse as sp
+
+
+def process_context():
+    """
+    Prefers a fork server with the solver modules preloaded, so workers start
+    quickly without forking the multi-threaded API process.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["backend.solver"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def reseed():
+    """
+    Reseeds NumPy's global generator from OS entropy. Workers forked from the
+    same server would otherwise all draw the same random numbers.
+    """
+    np.random.seed()
+
+
+def exit_on_sigterm():
+    """
+    Turns SIGTERM into SystemExit so that cleanup in finally blocks, such as
+    stopping child workers and unlinking shared memory, runs on cancellation.
+    """
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+
+
+class SharedMatrix:
+    """
+    Places a dense or CSR QUBO matrix in multiprocessing.shared_memory so
+    worker processes can map it instead of receiving a pickled copy. A
+    memory-mapped .npy file, such as a stored matrix, is not copied: the
+    workers map the same file.
+
+    The creating process owns the segments and must call close(); workers
+    rebuild a read-only view with SharedMatrix.attach(descriptor).
+    """
+    def __init__(self, matrix):
+        self._segments = []
+        if isinstance(matrix, np.memmap) and isinstance(matrix.base, mmap.mmap) and matrix.filename:
+            # The whole mapping rather than a view of it, so offset locates the data
+            order = "F" if matrix.flags.f_contiguous and not matrix.flags.c_contiguous else "C"
+            self.descriptor = {
+                "format": "memmap", "shape": matrix.shape, "path": matrix.filename,
+                "offset": matrix.offset, "dtype": matrix.dtype.str, "order": order
+            }
+            return
+        if sp.issparse(matrix):
+            matrix = matrix.tocsr()
+            arrays = {"data": matrix.data, "indices": matrix.indices, "indptr": matrix.indptr}
+            matrix_format = "csr"
+        else:
+            arrays = {"data": np.ascontiguousarray(matrix)}
+            matrix_format = "dense"
+
+        layout = {}
+        for key, array in arrays.items():
+            segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+            self._segments.append(segment)
+            layout[key] = (segment.name, array.shape, array.dtype.str)
+
+        self.descriptor = {"format": matrix_format, "shape": matrix.shape, "arrays": layout}
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def attach(descriptor: Dict[str, Any]) -> Tuple[Any, List[shared_memory.SharedMemory]]:
+        """
+        Maps the matrix described by descriptor. Returns the matrix and the
+        attached segments, which must stay referenced while it is in use.
+        """
+        if descriptor["format"] == "memmap":
+            matrix = np.memmap(descriptor["path"], dtype=np.dtype(descriptor["dtype"]), mode="r",
+                               offset=descriptor["offset"], shape=tuple(descriptor["shape"]),
+                               order=descriptor["order"])
+            return matrix, []
+        segments = []
+        arrays = {}
+        for key, (name, shape, dtype) in descriptor["arrays"].items():
+            # Workers share the creator's resource tracker, so attaching does
+            # not hand ownership of the segment to the worker
+            segment = shared_memory.SharedMemory(name=name)
+            segments.append(segment)
+            arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+            arrays[key].flags.writeable = False
+
+        if descriptor["format"] == "csr":
+            matrix = sp.csr_matrix(
+                (arrays["data"], arrays["indices"], arrays["indptr"]), shape=descriptor["shape"]
+            )
+        else:
+            matrix = arrays["data"]
+        return matrix, segments
@@ -0,0 +1,99 @@
+# Seeded QUBO instance generators for benchmarking
+import numpy as np
+import scipy.sparse as sp
+
+
+def random_dense(n, seed=0):
+    """
+    Dense symmetric QUBO with standard normal coefficients.
+
+    Returns:
+        Tuple of (QUBO matrix, constant, known optimum or None)
+    """
+    rng = np.random.default_rng(seed)
+    matrix = rng.normal(size=(n, n))
+    return (matrix + matrix.T) / 2, 0.0, None
+
+
+def sparse_maxcut(n, degree=3, seed=0):
+    """
+    Max-cut on a random graph with about n * degree / 2 unit-weight edges, as
+    a CSR QUBO whose energy is minus the cut size.
+
+    Returns:
+        Tuple of (QUBO matrix, constant, known optimum or None)
+    """
+    rng = np.random.default_rng(seed)
+    num_edges = n * degree // 2
+    rows = rng.integers(0, n, num_edges)
+    cols = rng.integers(0, n, num_edges)
+    keep = rows != cols
+    rows, cols = np.minimum(rows, cols)[keep], np.maximum(rows, cols)[keep]
+    edges = np.unique(np.stack([rows, cols], axis=1), axis=0)
+    rows, cols = edges[:, 0], edges[:, 1]
+
+    # cut(i, j) = x_i + x_j - 2 x_i x_j, minimized as -cut
+    degrees = np.bincount(rows, minlength=n) + np.bincount(cols, minlength=n)
+    matrix = sp.coo_matrix(
+        (np.concatenate([np.full(len(rows), 2.0), -degrees.astype(float)]),
+         (np.concatenate([rows, np.arange(n)]), np.concatenate([cols, np.arange(n)]))),
+        shape=(n, n)
+    )
+    return matrix.tocsr(), 0.0, None
+
+
+def planted_solution(n, density=0.1, seed=0):
+    """
+    QUBO with a planted ground state of energy 0. In terms of y = x XOR s the
+    energy is sum_i a_i y_i + sum_{i<j} b_ij y_i y_j with a_i exceeding the
+    total |b_ij| of row i, so y = 0 (x = s) is the unique minimum.
+
+    Returns:
+        Tuple of (QUBO matrix, constant, known optimum)
+    """
+    rng = np.random.default_rng(seed)
+    planted = rng.integers(0, 2, n)
+    couplings = np.triu(rng.uniform(-1, 1, (n, n)) * (rng.random((n, n)) < density), k=1)
+    linear = np.abs(couplings).sum(axis=1) + np.abs(couplings).sum(axis=0) + rng.uniform(0.1, 1, n)
+
+    # Substitute y = s + sign * x with sign = 1 - 2s
+    sign = 1 - 2 * planted
+    matrix = sign[:, None] * couplings * sign[None, :]
+    coupled = couplings @ planted + couplings.T @ planted
+    matrix[np.diag_indices(n)] += sign * (linear + coupled)
+    constant = float(linear @ planted + planted @ couplings @ planted)
+    return matrix, constant, 0.0
+
+
+def penalty_assignment(num_groups, group_size=4, penalty=None, seed=0):
+    """
+    One-hot assignment problem: every group of group_size variables must have
+    exactly one variable set, enforced by the penalty P * (sum_k x_gk - 1)^2,
+    plus random linear costs. The optimum picks the cheapest variable of each
+    group.
+
+    Returns:
+        Tuple of (QUBO matrix, constant, known optimum)
+    """
+    rng = np.random.default_rng(seed)
+    n = num_groups * group_size
+    costs = rng.uniform(0, 1, (num_groups, group_size))
+    if penalty is None:
+        penalty = 2.0 * costs.max()
+
+    matrix = np.zeros((n, n))
+    for group in range(num_groups):
+        members = slice(group * group_size, (group + 1) * group_size)
+        block = np.triu(np.full((group_size, group_size), 2.0 * penalty), k=1)
+        block[np.diag_indices(group_size)] = costs[group] - penalty
+        matrix[members, members] = block
+    constant = penalty * num_groups
+    return matrix, constant, float(costs.min(axis=1).sum())
+
+
+GENERATORS = {
+    "random-dense": lambda n, seed: random_dense(n, seed),
+    "sparse-maxcut": lambda n, seed: sparse_maxcut(n, seed=seed),
+    "planted": lambda n, seed: planted_solution(n, seed=seed),
+    "penalty": lambda n, seed: penalty_assignment(max(n // 4, 1), 4, seed=seed)
+}
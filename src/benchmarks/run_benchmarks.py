@@ -0,0 +1,212 @@
+"""
+QUBO solver benchmark suite.
+
+Runs solvers from backend.solver.SOLVERS on seeded instances from
+benchmarks.generators and reports, per instance and solver: wall time,
+energy evaluations and accepted flips per second, time-to-target, success
+probability and peak memory.
+
+Example:
+    python -m benchmarks.run_benchmarks --sizes 100 500 --repeats 5 --format csv
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+import tracemalloc
+import numpy as np
+from algorithms import instrumentation
+from algorithms.progress import ProgressReporter
+from backend.solver import SOLVERS
+from benchmarks.generators import GENERATORS
+
+# Instrumentation counters reported as rates; iterations mean different
+# amounts of work in different solvers, these do not
+RATE_COUNTERS = ("energy_evaluations", "accepted_flips")
+
+# Keeps the slowest solvers within a benchmark-friendly budget by default
+DEFAULT_PARAMETERS = {
+    "quantum-inspired": {"max_iters": 2, "opt_time": 1, "rl_time": 1},
+    "portfolio": {"time_limit": 10}
+}
+
+
+class ImprovementTrace(ProgressReporter):
+    """
+    ProgressReporter that timestamps every improvement of the best cost, so
+    the time-to-target can be computed afterwards for any target.
+    """
+    def __init__(self):
+        super().__init__(keep_trace=False)
+        self.improvements = []
+
+    def update(self, best_cost):
+        if best_cost < self.best_cost:
+            self.improvements.append((time.perf_counter() - self.start_time, float(best_cost)))
+        super().update(best_cost)
+
+    def time_to(self, target, tolerance=1e-9):
+        for elapsed, cost in self.improvements:
+            if cost <= target + tolerance:
+                return elapsed
+        return None
+
+
+def run_once(solver_type, qubo_matrix, constant, parameters, seed, measure_memory=False):
+    """
+    Runs one seeded solve and returns its raw measurements, including the
+    totals of RATE_COUNTERS over all labels.
+    """
+    np.random.seed(seed)
+    trace = ImprovementTrace()
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with instrumentation.profile() as metrics:
+            _, best_cost, _, _ = SOLVERS[solver_type](qubo_matrix, constant, dict(parameters), progress=trace)
+    finally:
+        wall_time = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if measure_memory else None
+        if measure_memory:
+            tracemalloc.stop()
+    trace.update(best_cost)
+    counters = {name: 0 for name in RATE_COUNTERS}
+    for (name, _), value in metrics.counters.items():
+        if name in counters:
+            counters[name] += value
+    return {
+        "best_cost": float(best_cost),
+        "wall_time": wall_time,
+        "counters": counters,
+        "trace": trace,
+        "peak_memory": peak_memory
+    }
+
+
+def summarize(runs, target):
+    """
+    Aggregates repeated runs against a target energy. The time-to-solution at
+    99% confidence is TTT * log(0.01) / log(1 - p) for success probability p.
+    Counter rates are None for solvers that do not record the counter.
+    """
+    times_to_target = [run["trace"].time_to(target) for run in runs]
+    successes = [t for t in times_to_target if t is not None]
+    success_probability = len(successes) / len(runs)
+    mean_ttt = float(np.mean(successes)) if successes else None
+    if success_probability >= 1:
+        tts99 = mean_ttt
+    elif successes:
+        tts99 = mean_ttt * np.log(0.01) / np.log(1 - success_probability)
+    else:
+        tts99 = None
+    wall_times = [run["wall_time"] for run in runs]
+    rates = {}
+    for name in RATE_COUNTERS:
+        total = sum(run["counters"][name] for run in runs)
+        rates[f"{name}_per_second"] = float(total / sum(wall_times)) if total else None
+    return {
+        "target": target,
+        "best_cost": min(run["best_cost"] for run in runs),
+        "mean_cost": float(np.mean([run["best_cost"] for run in runs])),
+        "mean_wall_time": float(np.mean(wall_times)),
+        **rates,
+        "success_probability": success_probability,
+        "mean_time_to_target": mean_ttt,
+        "time_to_solution_99": tts99
+    }
+
+
+def run_benchmarks(problems, sizes, solvers, repeats=3, seed=0, parameters=None, measure_memory=True):
+    """
+    Runs every solver on every (problem, size) instance.
+
+    The target energy is the instance's known optimum when the generator
+    provides one, otherwise the best cost found by any solver on it.
+
+    Returns:
+        List of result records, one per (problem, size, solver)
+    """
+    parameters = {**DEFAULT_PARAMETERS, **(parameters or {})}
+    records = []
+    for problem in problems:
+        for size in sizes:
+            qubo_matrix, constant, optimum = GENERATORS[problem](size, seed)
+            instance_runs = {}
+            errors = {}
+            for solver_type in solvers:
+                solver_parameters = parameters.get(solver_type, {})
+                try:
+                    instance_runs[solver_type] = [
+                        run_once(solver_type, qubo_matrix, constant, solver_parameters, seed + repeat)
+                        for repeat in range(repeats)
+                    ]
+                    if measure_memory:
+                        instance_runs[solver_type][0]["peak_memory"] = run_once(
+                            solver_type, qubo_matrix, constant, solver_parameters, seed, measure_memory=True
+                        )["peak_memory"]
+                except Exception as e:
+                    errors[solver_type] = str(e)
+
+            best_found = min(
+                (run["best_cost"] for runs in instance_runs.values() for run in runs),
+                default=None
+            )
+            target = optimum if optimum is not None else best_found
+            for solver_type in solvers:
+                record = {"problem": problem, "size": size, "solver": solver_type, "repeats": repeats}
+                if solver_type in errors:
+                    record["error"] = errors[solver_type]
+                else:
+                    runs = instance_runs[solver_type]
+                    record.update(summarize(runs, target))
+                    record["peak_memory_bytes"] = runs[0]["peak_memory"]
+                records.append(record)
+    return records
+
+
+def write_records(records, output_format, stream):
+    if output_format == "json":
+        json.dump(records, stream, indent=2)
+        stream.write("\n")
+        return
+    fields = []
+    for record in records:
+        fields.extend(key for key in record if key not in fields)
+    writer = csv.DictWriter(stream, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the registered QUBO solvers")
+    parser.add_argument("--problems", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[50, 200])
+    parser.add_argument("--solvers", nargs="+", default=list(SOLVERS), choices=list(SOLVERS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--parameters", help="JSON file mapping solver type to solver parameters")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the extra peak-memory run")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    parameters = None
+    if args.parameters:
+        with open(args.parameters) as f:
+            parameters = json.load(f)
+
+    records = run_benchmarks(
+        args.problems, args.sizes, args.solvers, args.repeats, args.seed,
+        parameters, measure_memory=not args.no_memory
+    )
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_records(records, args.format, f)
+    else:
+        write_records(records, args.format, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
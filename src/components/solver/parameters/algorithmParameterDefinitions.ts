@@ -115,16 +115,7 @@ export const parameters: AlgorithmParameters = {
       min: 1,
       max: 50,
       step: 1,
-      tooltip: "Number of iterations a solution remains in the tabu list"
-    },
-    {
-      name: "neighborhood-size",
-      label: "Neighborhood Size",
-      defaultValue: 10,
-      min: 5,
-      max: 50,
-      step: 5,
-      tooltip: "Number of neighbor solutions to evaluate in each iteration"
+      tooltip: "Number of iterations a flipped variable remains tabu"
     }
   ],
   "genetic-algorithm": [
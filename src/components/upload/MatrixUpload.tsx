@@ -21,7 +21,8 @@ export const MatrixUpload = ({ onMatrixLoaded }: MatrixUploadProps) => {
         const formData = new FormData();
         formData.append('file', uploadedFile);
         
-        const response = await fetch('http://localhost:8000/api/load-matrix', {
+        // The preview needs the matrix itself, which the endpoint only returns on request
+        const response = await fetch('http://localhost:8000/api/load-matrix?include_matrix=true', {
           method: 'POST',
           body: formData,
         });